@@ -0,0 +1,137 @@
+"""Асинхронные точки входа для чтения каталога под ASGI.
+
+Django 3.2 выполняет синхронные вьюхи под ASGI в одном общем потоке,
+поэтому запросы к каталогу обрабатываются строго по очереди. Здесь
+GET-запросы к произведениям, категориям, жанрам, отзывам и комментариям
+обрабатываются асинхронной вьюхой, которая выполняет блокирующую часть
+(ORM и сериализацию) в ограниченном пуле из ``ASYNC_VIEW_WORKERS``
+потоков. Асинхронного ORM и асинхронных вьюх DRF в этой версии нет,
+поэтому сама обработка запроса остаётся прежней.
+
+Выгрузки таблиц тоже обрабатываются в этом пуле, чтобы долгая выгрузка
+не занимала общий поток синхронных вьюх. Остальные методы и вьюхи идут
+по обычному пути Django. WSGI этот модуль не затрагивает: асинхронные
+вьюхи подключаются URLconf ``api_yamdb.asgi_urls`` только при
+``YAMDB_ASYNC_VIEWS=1``. По умолчанию они выключены: в замерах
+``benchmark --asgi`` пул потоков не дал прироста пропускной способности.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from threading import Lock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import FileResponse
+from django.urls import URLPattern, URLResolver
+
+from .export import spool
+from .views import (
+    CategoryViewSet,
+    CommentsViewSet,
+    ExportView,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+)
+
+ASYNC_VIEWS = (
+    CategoryViewSet,
+    CommentsViewSet,
+    ExportView,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+)
+ASYNC_METHODS = ('GET', 'HEAD')
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_VIEW_WORKERS,
+                thread_name_prefix='async-view',
+            )
+        return _executor
+
+
+def spool_response(response):
+    """Переносит потоковый ответ во временный файл ``FileResponse``.
+
+    Файл держит в памяти не больше ``EXPORT_SPOOL_MAX_SIZE`` байт, поэтому
+    большие страницы списков, как и выгрузки, не собираются в памяти
+    целиком.
+    """
+    file_response = FileResponse(
+        spool(response),
+        status=response.status_code,
+        content_type=response['Content-Type'],
+    )
+    for header, value in response.items():
+        file_response[header] = value
+    file_response.cookies = response.cookies
+    return file_response
+
+
+def run_view(view, request, args, kwargs):
+    """Выполняет синхронную вьюху в рабочем потоке и готовит ответ.
+
+    Под ASGI Django читает потоковый ответ прямо в цикле событий, где
+    запросы к базе запрещены, поэтому такой ответ записывается во
+    временный файл здесь же. Исключение - ``FileResponse``: он читает уже
+    готовый файл. Соединения потока закрываются так же, как в конце
+    обычного запроса.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        if response.streaming and not isinstance(response, FileResponse):
+            response = spool_response(response)
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    """Асинхронная обёртка вьюхи для безопасных методов."""
+    run_sync = sync_to_async(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ASYNC_METHODS:
+            return await run_sync(request, *args, **kwargs)
+        return await sync_to_async(
+            run_view, thread_sensitive=False, executor=get_executor()
+        )(view, request, args, kwargs)
+
+    return wrapper
+
+
+def async_patterns(patterns):
+    """Копия URL-шаблонов, где вьюхи каталога заменены асинхронными."""
+    result = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            pattern = URLResolver(
+                pattern.pattern,
+                async_patterns(pattern.url_patterns),
+                pattern.default_kwargs,
+                pattern.app_name,
+                pattern.namespace,
+            )
+        elif getattr(pattern.callback, 'cls', None) in ASYNC_VIEWS:
+            pattern = URLPattern(
+                pattern.pattern,
+                async_view(pattern.callback),
+                pattern.default_args,
+                pattern.name,
+            )
+        result.append(pattern)
+    return result
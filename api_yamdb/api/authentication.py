@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Потокобезопасный LRU-кэш пользователей с коротким временем жизни.
+
+    Размер и время жизни задаются настройками ``AUTH_USER_CACHE_SIZE`` и
+    ``AUTH_USER_CACHE_TTL``. Кэш живёт в памяти процесса, поэтому
+    изменения пользователя в другом процессе видны не позже чем через
+    время жизни записи.
+    """
+
+    def __init__(self):
+        self._users = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            item = self._users.get(user_id)
+            if item is None:
+                return None
+            expires, user = item
+            if expires < monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._users[user_id] = (
+                monotonic() + settings.AUTH_USER_CACHE_TTL, user
+            )
+            self._users.move_to_end(user_id)
+            while len(self._users) > settings.AUTH_USER_CACHE_SIZE:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация, которая берёт пользователя из кэша процесса.
+
+    Таблица пользователей читается только при промахе кэша. Каждый запрос
+    получает свою копию объекта, чтобы изменения в одном запросе не
+    попадали в другие.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        return copy(user)
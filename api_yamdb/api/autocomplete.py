@@ -0,0 +1,250 @@
+"""Автодополнение названий категорий, жанров и произведений.
+
+Индекс хранится в памяти процесса. WSGI- и ASGI-приложения строят его
+в фоновом потоке при запуске, остальные процессы - при первом
+обращении. Изменения моделей попадают в него через сигналы, а изменения
+из других процессов - при перестроении: индекс старше
+``AUTOCOMPLETE_MAX_AGE`` секунд перестраивается в фоновом потоке, а
+запросы до замены продолжают читать старый.
+
+Поиск по префиксу идёт бинарным поиском по отсортированному списку
+ключей: для каждого слова названия хранится ключ от этого слова до
+конца названия. Если совпадений по префиксу не хватает, добавляются
+похожие названия по триграммам, что позволяет находить их с опечатками.
+"""
+from bisect import bisect_left, insort
+from collections import Counter
+from threading import Lock, Thread
+from time import monotonic
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from reviews.models import Category, Genre, Title
+
+MIN_SIMILARITY = 0.3
+# Триграммы, которые встречаются в большем числе названий, не помогают
+# отличить одно название от другого и при поиске похожих пропускаются.
+MAX_POSTING_SIZE = 500
+# Сколько названий с наибольшим числом общих триграмм проверяется.
+MAX_CANDIDATES = 50
+
+
+def normalize(text):
+    return ' '.join(text.casefold().replace('ё', 'е').split())
+
+
+def get_keys(name):
+    words = normalize(name).split(' ')
+    return {' '.join(words[idx:]) for idx in range(len(words))}
+
+
+def get_trigrams(text):
+    padded = f'  {normalize(text)} '
+    return {padded[idx:idx + 3] for idx in range(len(padded) - 2)}
+
+
+class KindIndex:
+    """Индекс одного типа объектов.
+
+    Изменяет индекс только ``AutocompleteIndex`` под блокировкой, а
+    поиск идёт без неё: он читает список ключей и словари отдельными
+    атомарными операциями и пропускает то, что удалено между ними.
+    """
+
+    def __init__(self, items):
+        self.items = {}
+        self.keys = []
+        self.trigrams = {}
+        for item in items:
+            self.items[item['key']] = item
+            self.keys.extend((key, item['key']) for key in get_keys(
+                item['name']
+            ))
+            self.add_trigrams(item)
+        self.keys.sort()
+
+    def add_trigrams(self, item):
+        for trigram in get_trigrams(item['name']):
+            self.trigrams.setdefault(trigram, set()).add(item['key'])
+
+    def add(self, item):
+        self.remove(item['key'])
+        self.items[item['key']] = item
+        for key in get_keys(item['name']):
+            insort(self.keys, (key, item['key']))
+        self.add_trigrams(item)
+
+    def remove(self, item_key):
+        item = self.items.pop(item_key, None)
+        if item is None:
+            return
+        for key in get_keys(item['name']):
+            position = bisect_left(self.keys, (key, item_key))
+            if (position < len(self.keys)
+                    and self.keys[position] == (key, item_key)):
+                del self.keys[position]
+        for trigram in get_trigrams(item['name']):
+            self.trigrams.get(trigram, set()).discard(item_key)
+
+    def lookup(self, query, limit):
+        prefix = normalize(query)
+        found = []
+        position = bisect_left(self.keys, (prefix,))
+        while len(found) < limit:
+            try:
+                key, item_key = self.keys[position]
+            except IndexError:
+                break
+            if not key.startswith(prefix):
+                break
+            if item_key not in found:
+                found.append(item_key)
+            position += 1
+        if len(found) < limit:
+            found.extend(self.similar(prefix, limit - len(found), found))
+        items = (self.items.get(item_key) for item_key in found)
+        return [item for item in items if item is not None]
+
+    def similar(self, query, limit, exclude):
+        """Названия, похожие на запрос по коэффициенту Жаккара триграмм.
+
+        Кандидаты отбираются только по редким триграммам запроса, а
+        сходство считается для ``MAX_CANDIDATES`` лучших из них, поэтому
+        время поиска не растёт с размером таблицы.
+        """
+        query_trigrams = get_trigrams(query)
+        overlaps = Counter()
+        for trigram in query_trigrams:
+            posting = self.trigrams.get(trigram, ())
+            if len(posting) <= MAX_POSTING_SIZE:
+                overlaps.update(list(posting))
+        scored = []
+        for item_key, _ in overlaps.most_common(MAX_CANDIDATES):
+            item = self.items.get(item_key)
+            if item is None or item_key in exclude:
+                continue
+            trigrams = get_trigrams(item['name'])
+            similarity = len(query_trigrams & trigrams) / len(
+                query_trigrams | trigrams
+            )
+            if similarity >= MIN_SIMILARITY:
+                scored.append((-similarity, item['name'], item_key))
+        scored.sort()
+        return [item_key for _, _, item_key in scored[:limit]]
+
+
+def category_item(category):
+    return {'key': category.pk, 'name': category.name,
+            'slug': category.slug}
+
+
+def genre_item(genre):
+    return {'key': genre.pk, 'name': genre.name, 'slug': genre.slug}
+
+
+def title_item(title):
+    return {'key': title.pk, 'id': title.pk, 'name': title.name,
+            'year': title.year}
+
+
+KINDS = {
+    'categories': (Category, category_item, ('id', 'name', 'slug')),
+    'genres': (Genre, genre_item, ('id', 'name', 'slug')),
+    'titles': (Title, title_item, ('id', 'name', 'year')),
+}
+
+
+class AutocompleteIndex:
+    """Потокобезопасный набор индексов по типам объектов.
+
+    Блокировка берётся только для изменений по сигналам и для замены
+    индекса. Перестроение читает таблицу без неё; изменения, пришедшие
+    за это время, применяются к новому индексу перед заменой.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._pending = {}
+        self._lock = Lock()
+
+    def build(self, kind):
+        """Строит индекс ``kind`` заново и подменяет им текущий."""
+        with self._lock:
+            if kind in self._pending:
+                return
+            self._pending[kind] = []
+        try:
+            model, to_item, fields = KINDS[kind]
+            index = KindIndex(
+                to_item(obj)
+                for obj in model.objects.only(*fields).order_by().iterator()
+            )
+        except BaseException:
+            with self._lock:
+                self._pending.pop(kind, None)
+            raise
+        with self._lock:
+            for change in self._pending.pop(kind, ()):
+                change(index)
+            self._indexes[kind] = (index, monotonic())
+
+    def build_in_background(self, *kinds):
+        """Перестраивает индексы в отдельном потоке и возвращает его."""
+
+        def build():
+            try:
+                for kind in kinds:
+                    self.build(kind)
+            except DatabaseError:
+                # Таблиц ещё нет: индекс построится при первом обращении.
+                pass
+            finally:
+                connections.close_all()
+
+        thread = Thread(target=build, name='autocomplete-index', daemon=True)
+        thread.start()
+        return thread
+
+    def start(self):
+        """Строит все индексы в фоне при запуске приложения."""
+        return self.build_in_background(*KINDS)
+
+    def get_index(self, kind):
+        index, built = self._indexes.get(kind, (None, 0))
+        if index is None:
+            self.build(kind)
+            index, built = self._indexes.get(kind, (None, 0))
+        elif (monotonic() - built > settings.AUTOCOMPLETE_MAX_AGE
+                and kind not in self._pending):
+            self.build_in_background(kind)
+        return index
+
+    def lookup(self, kind, query, limit):
+        index = self.get_index(kind)
+        items = index.lookup(query, limit) if index is not None else []
+        return [
+            {field: value for field, value in item.items() if field != 'key'}
+            for item in items
+        ]
+
+    def change(self, kind, change):
+        with self._lock:
+            if kind in self._pending:
+                self._pending[kind].append(change)
+            if kind in self._indexes:
+                change(self._indexes[kind][0])
+
+    def update(self, kind, obj):
+        item = KINDS[kind][1](obj)
+        self.change(kind, lambda index: index.add(item))
+
+    def remove(self, kind, pk):
+        self.change(kind, lambda index: index.remove(pk))
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+autocomplete_index = AutocompleteIndex()
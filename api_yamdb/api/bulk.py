@@ -0,0 +1,24 @@
+"""Массовая вставка объектов."""
+from django.conf import settings
+
+
+def bulk_create_with_ids(model, objects):
+    """``bulk_create``, после которого у всех объектов заполнен ``pk``.
+
+    Если СУБД не возвращает id вставленных строк (SQLite в Django 3.2),
+    они читаются из таблицы: вызов должен идти внутри транзакции, в
+    которой вставка не перемежается с другими, и тогда новые id - это
+    ``len(objects)`` последних id таблицы в порядке вставки.
+    """
+    objects = model.objects.bulk_create(
+        objects, batch_size=settings.BULK_BATCH_SIZE
+    )
+    if objects and objects[0].pk is None:
+        ids = sorted(
+            model.objects.order_by('-pk').values_list('pk', flat=True)[
+                :len(objects)
+            ]
+        )
+        for obj, pk in zip(objects, ids):
+            obj.pk = pk
+    return objects
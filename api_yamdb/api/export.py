@@ -0,0 +1,138 @@
+"""Потоковая выгрузка таблиц в CSV и NDJSON.
+
+Столбцы совпадают с файлами ``static/data``, которые читает команда
+``loadcsv``, поэтому выгрузку можно загрузить обратно. Строки читаются
+из базы через ``iterator(chunk_size=...)`` и сразу кодируются, так что
+расход памяти не зависит от размера таблицы.
+
+Под ASGI Django 3.2 читает потоковый ответ прямо в цикле событий, где
+запросы к базе запрещены. Поэтому там выгрузка сначала записывается во
+временный файл в потоке вьюхи (``spool``), а отдаётся уже файл.
+"""
+import csv
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+
+from reviews.models import Comments, Review, Title
+
+from .fast_serializers import get_datetime_formatter
+from .renderers import FastJSONRenderer
+
+# Имя таблицы в URL: (модель, имя файла loadcsv, (столбец, поле модели)).
+EXPORTS = {
+    'titles': (
+        Title,
+        'titles.csv',
+        (
+            ('id', 'id'),
+            ('name', 'name'),
+            ('year', 'year'),
+            ('category', 'category_id'),
+            ('description', 'description'),
+        ),
+    ),
+    'reviews': (
+        Review,
+        'review.csv',
+        (
+            ('id', 'id'),
+            ('title_id', 'title_id'),
+            ('text', 'text'),
+            ('author', 'author_id'),
+            ('score', 'score'),
+            ('pub_date', 'pub_date'),
+        ),
+    ),
+    'comments': (
+        Comments,
+        'comments.csv',
+        (
+            ('id', 'id'),
+            ('review_id', 'review_id'),
+            ('text', 'text'),
+            ('author', 'author_id'),
+            ('pub_date', 'pub_date'),
+        ),
+    ),
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """Объект-файл для ``csv.writer``, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def get_rows(table):
+    """Строки таблицы по порядку id с датами в формате API."""
+    model, _, columns = EXPORTS[table]
+    fields = [field for _, field in columns]
+    to_datetime = get_datetime_formatter()
+    converters = [
+        to_datetime if field == 'pub_date' else None for field in fields
+    ]
+    for row in model.objects.order_by('id').values_list(*fields).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    ):
+        yield [
+            value if convert is None or value is None else convert(value)
+            for value, convert in zip(row, converters)
+        ]
+
+
+def iter_chunks(rows):
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, settings.EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_csv(table):
+    _, _, columns = EXPORTS[table]
+    writer = csv.writer(Echo())
+    yield writer.writerow([column for column, _ in columns])
+    for chunk in iter_chunks(get_rows(table)):
+        yield ''.join(
+            writer.writerow(['' if value is None else value for value in row])
+            for row in chunk
+        )
+
+
+def iter_ndjson(table):
+    _, _, columns = EXPORTS[table]
+    names = [column for column, _ in columns]
+    renderer = FastJSONRenderer()
+    for chunk in iter_chunks(get_rows(table)):
+        yield b''.join(
+            renderer.encode(dict(zip(names, row))) + b'\n' for row in chunk
+        )
+
+
+def export(table, extension):
+    """Итератор частей выгрузки таблицы в формате ``extension``."""
+    if extension == 'csv':
+        return iter_csv(table)
+    return iter_ndjson(table)
+
+
+def spool(chunks):
+    """Записывает части выгрузки во временный файл и возвращает его.
+
+    Первые ``EXPORT_SPOOL_MAX_SIZE`` байт хранятся в памяти, остальное -
+    на диске.
+    """
+    file = SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_MAX_SIZE)
+    for chunk in chunks:
+        file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+    file.seek(0)
+    return file
@@ -0,0 +1,147 @@
+"""Сериализаторы только для чтения для списков без рефлексии DRF.
+
+Работают со строками ``values()`` и собирают словари напрямую, поэтому
+не создают экземпляры моделей и не вызывают ``to_representation`` для
+каждого поля. Вывод совпадает с выводом обычных сериализаторов из
+``api/serializers.py`` байт в байт, что проверяют тесты.
+"""
+from operator import itemgetter
+
+from rest_framework import ISO_8601
+from rest_framework.fields import DateTimeField
+from rest_framework.settings import api_settings
+
+from reviews.models import Genre
+
+
+def get_datetime_formatter():
+    """Аналог ``DateTimeField.to_representation`` для значений из БД.
+
+    Часовой пояс определяется один раз на страницу. При формате даты,
+    отличном от ISO 8601, используется сам ``DateTimeField``.
+    """
+    field = DateTimeField()
+    output_format = api_settings.DATETIME_FORMAT
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def to_representation(value):
+        if value is None:
+            return None
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return to_representation
+
+
+class FastSerializer:
+    """Базовый класс быстрого сериализатора.
+
+    ``lookups`` - поля ответа в порядке обычного сериализатора и поля
+    модели, нужные для каждого из них; ``required`` - поля, которые
+    выбираются всегда (для пагинации и связанных запросов).
+    ``get_converters`` возвращает функции ``строка -> значение`` для
+    полей ответа. Если передан ``fields``, в ответ попадают только
+    перечисленные поля.
+    """
+
+    lookups = {}
+    required = ('id',)
+
+    def __init__(self, fields=None):
+        self.output = [
+            name for name in self.lookups if fields is None or name in fields
+        ]
+
+    def get_lookups(self):
+        lookups = dict.fromkeys(self.required)
+        for name in self.output:
+            lookups.update(dict.fromkeys(self.lookups[name]))
+        return list(lookups)
+
+    def get_rows(self, queryset):
+        """Строки queryset с сохранением фильтров и сортировки."""
+        if queryset._prefetch_related_lookups:
+            queryset = queryset.prefetch_related(None)
+        return queryset.values(
+            *self.get_lookups(), *queryset.query.extra_select
+        )
+
+    def get_converters(self, rows):
+        return {name: itemgetter(name) for name in self.output}
+
+    def serialize(self, rows):
+        converters = self.get_converters(rows)
+        output = [(name, converters[name]) for name in self.output]
+        return [
+            {name: convert(row) for name, convert in output} for row in rows
+        ]
+
+
+class TitleFastSerializer(FastSerializer):
+    """Аналог ``TitleSerializer``."""
+
+    lookups = {
+        'id': ('id',),
+        'category': ('category__name', 'category__slug'),
+        'genre': (),
+        'rating': ('rating',),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+    }
+
+    def get_converters(self, rows):
+        converters = super().get_converters(rows)
+        converters['category'] = self.get_category
+        if 'genre' in self.output:
+            genres = {row['id']: [] for row in rows}
+            for title_id, name, slug in Genre.objects.filter(
+                genres__in=list(genres)
+            ).values_list('genres', 'name', 'slug'):
+                genres[title_id].append({'name': name, 'slug': slug})
+            converters['genre'] = lambda row: genres[row['id']]
+        return converters
+
+    @staticmethod
+    def get_category(row):
+        if row['category__slug'] is None:
+            return None
+        return {'name': row['category__name'], 'slug': row['category__slug']}
+
+
+class ReviewFastSerializer(FastSerializer):
+    """Аналог ``ReviewSerializer``."""
+
+    lookups = {
+        'id': ('id',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'title': ('title',),
+        'text': ('text',),
+        'pub_date': ('pub_date',),
+    }
+    required = ('id', 'pub_date')
+
+    def get_converters(self, rows):
+        converters = super().get_converters(rows)
+        converters['author'] = itemgetter('author__username')
+        to_datetime = get_datetime_formatter()
+        converters['pub_date'] = lambda row: to_datetime(row['pub_date'])
+        return converters
+
+
+class CommentsFastSerializer(ReviewFastSerializer):
+    """Аналог ``CommentsSerializer``."""
+
+    lookups = {
+        'id': ('id',),
+        'author': ('author__username',),
+        'review': ('review',),
+        'text': ('text',),
+        'pub_date': ('pub_date',),
+    }
@@ -1,7 +1,10 @@
 from django_filters import CharFilter, FilterSet
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
 
+from .search import get_search_backend
+
 
 class TitleFilterSet(FilterSet):
     category = CharFilter(field_name='category__slug')
@@ -13,3 +16,15 @@ class TitleFilterSet(FilterSet):
         fields = {
             'year': ['exact'],
         }
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по названию и описанию произведения."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
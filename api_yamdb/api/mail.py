@@ -0,0 +1,156 @@
+"""Очередь исходящих писем.
+
+Класс очереди задаётся настройкой ``MAIL_QUEUE_BACKEND``. Письма из
+``DatabaseMailQueue`` отправляет команда ``send_queued_emails``.
+"""
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from reviews.models import QueuedEmail
+
+
+class SyncMailQueue:
+    """Отправляет письмо сразу, в процессе обработки запроса."""
+
+    def enqueue(self, subject, body, to_email):
+        EmailMessage(subject=subject, body=body, to=[to_email]).send()
+
+
+class DatabaseMailQueue:
+    """Сохраняет письмо в таблицу очереди для фоновой отправки."""
+
+    def enqueue(self, subject, body, to_email):
+        QueuedEmail.objects.create(
+            subject=subject, body=body, to_email=to_email
+        )
+
+
+def get_mail_queue():
+    return import_string(settings.MAIL_QUEUE_BACKEND)()
+
+
+def get_retry_delay(attempts):
+    """Задержка перед следующей попыткой с экспоненциальным ростом."""
+    return timedelta(
+        seconds=settings.MAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_emails(batch_size, now):
+    """Занимает пачку писем, срок отправки которых наступил.
+
+    Письмо получает статус ``sending``, владельца и срок аренды в
+    ``next_attempt_at``: если обработчик упадёт, после этого срока
+    письмо снова займёт другой. Письмо с истёкшей арендой, у которого
+    уже ``MAIL_QUEUE_MAX_ATTEMPTS`` попыток, получает статус ``failed``:
+    иначе письмо, на котором падает обработчик, занималось бы вечно.
+    Условие повторяется в ``UPDATE``, поэтому одно письмо не займут два
+    обработчика и без ``SELECT ... FOR UPDATE``. Транзакция не включает
+    отправку и держит блокировку записи только на время трёх запросов.
+    """
+    owner = uuid4().hex
+    due = QueuedEmail.objects.filter(
+        status__in=(QueuedEmail.PENDING, QueuedEmail.SENDING),
+        next_attempt_at__lte=now,
+        attempts__lt=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+    )
+    with transaction.atomic():
+        QueuedEmail.objects.filter(
+            status=QueuedEmail.SENDING,
+            next_attempt_at__lte=now,
+            attempts__gte=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+        ).update(
+            status=QueuedEmail.FAILED,
+            claimed_by='',
+            last_error='Обработчик не завершил отправку письма.',
+        )
+        emails = due
+        if connection.features.has_select_for_update_skip_locked:
+            emails = emails.select_for_update(skip_locked=True)
+        ids = list(emails.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return owner, []
+        due.filter(id__in=ids).update(
+            status=QueuedEmail.SENDING,
+            claimed_by=owner,
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(
+                seconds=settings.MAIL_QUEUE_LEASE_SECONDS
+            ),
+        )
+    return owner, list(
+        QueuedEmail.objects.filter(id__in=ids, claimed_by=owner)
+    )
+
+
+def purge_sent_emails(now):
+    """Удаляет отправленные письма старше ``MAIL_QUEUE_SENT_RETENTION``.
+
+    В письмах лежат действующие коды подтверждения, поэтому после
+    отправки они хранятся только для разбора проблем с доставкой.
+    """
+    return QueuedEmail.objects.filter(
+        status=QueuedEmail.SENT,
+        sent_at__lt=now - timedelta(
+            seconds=settings.MAIL_QUEUE_SENT_RETENTION
+        ),
+    ).delete()[0]
+
+
+def send_queued_emails(batch_size, email_connection):
+    """Отправляет одну пачку писем, срок отправки которых наступил.
+
+    Письма уходят вне транзакции через переданное открытое соединение с
+    почтовым бэкендом, чтобы не устанавливать его заново для каждого
+    письма. Перед отправкой удаляются старые отправленные письма.
+    Возвращает количество отправленных писем и писем с ошибкой.
+    """
+    now = timezone.now()
+    purge_sent_emails(now)
+    owner, emails = claim_emails(batch_size, now)
+    if not emails:
+        return 0, 0
+    sent = failed = 0
+    for email in emails:
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            to=[email.to_email],
+            connection=email_connection,
+        )
+        try:
+            message.send()
+        except Exception as error:
+            failed += 1
+            email.last_error = str(error)
+            if email.attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+                email.status = QueuedEmail.FAILED
+            else:
+                email.status = QueuedEmail.PENDING
+                email.next_attempt_at = now + get_retry_delay(
+                    email.attempts
+                )
+        else:
+            sent += 1
+            email.status = QueuedEmail.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+    with transaction.atomic():
+        for email in emails:
+            QueuedEmail.objects.filter(
+                pk=email.pk, claimed_by=owner, status=QueuedEmail.SENDING
+            ).update(
+                status=email.status,
+                next_attempt_at=email.next_attempt_at,
+                last_error=email.last_error,
+                sent_at=email.sent_at,
+                claimed_by='',
+            )
+    return sent, failed
@@ -0,0 +1,239 @@
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import subprocess
+from tempfile import TemporaryDirectory
+
+import django
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import connection, connections
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from benchmarks import asgi, serializers, sqlite
+from benchmarks.runner import compare, run
+from benchmarks.seed import seed
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Замер времени ответа и числа запросов ко всем эндпоинтам API'
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('categories', 10),
+            ('genres', 20),
+            ('titles', 1000),
+            ('users', 100),
+            ('reviews', 10000),
+            ('comments', 10000),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help='Размер синтетического набора данных.',
+            )
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument(
+            '--only', nargs='*',
+            help='Имена сценариев, которые нужно выполнить.',
+        )
+        parser.add_argument(
+            '--serializers', nargs='*', type=int, metavar='PAGE_SIZE',
+            help='Сравнить обычные и быстрые сериализаторы списков на '
+                 'страницах заданного размера (по умолчанию 5, 100, 1000) '
+                 'вместо замеров эндпоинтов.',
+        )
+        parser.add_argument(
+            '--sqlite', action='store_true',
+            help='Сравнить пропускную способность смешанной нагрузки '
+                 'чтения и записи на файловой базе SQLite без PRAGMA и с '
+                 'настройками из settings.DATABASES.',
+        )
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help='Сравнить пропускную способность чтения каталога под ASGI '
+                 'с обычными и асинхронными вьюхами.',
+        )
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0)
+        parser.add_argument('--write-ratio', type=float, default=0.2)
+        parser.add_argument(
+            '--output', help='Файл для сохранения результатов в JSON.'
+        )
+        parser.add_argument(
+            '--compare', help='JSON предыдущего запуска для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        if options['sqlite']:
+            self.print_sqlite(sqlite.run(
+                threads=options['threads'],
+                duration=options['duration'],
+                write_ratio=options['write_ratio'],
+            ))
+            return
+        if options['asgi']:
+            mode = 'asgi'
+        elif options['serializers'] is not None:
+            mode = 'serializers'
+        else:
+            mode = 'endpoints'
+        dataset, results = self.run_on_test_database(
+            getattr(self, f'run_{mode}'), options
+        )
+        getattr(self, f'print_{mode}')(results)
+        if mode == 'endpoints' and options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                previous = json.load(file)['results']
+            self.print_changes(compare(previous, results))
+        if options['output']:
+            self.save(options['output'], dataset, results)
+
+    def run_on_test_database(self, run_mode, options):
+        """Заполняет отдельную тестовую базу и выполняет на ней замер."""
+        directory = None
+        if options['asgi']:
+            # Рабочие потоки открывают свои соединения, а общая база в
+            # памяти выполняет их запросы по очереди, поэтому замер под
+            # ASGI идёт на файловой базе.
+            directory = TemporaryDirectory()
+            connection.settings_dict['TEST']['NAME'] = str(
+                Path(directory.name) / 'benchmark.sqlite3'
+            )
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].creation.set_as_test_mirror(
+                connection.settings_dict
+            )
+        try:
+            dataset = seed(
+                categories=options['categories'],
+                genres=options['genres'],
+                titles=options['titles'],
+                users=options['users'],
+                reviews=options['reviews'],
+                comments=options['comments'],
+            )
+            return dataset, run_mode(dataset, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            if directory is not None:
+                directory.cleanup()
+
+    def run_asgi(self, dataset, options):
+        return asgi.run(
+            dataset,
+            concurrency=options['concurrency'],
+            requests=options['requests'],
+        )
+
+    def run_serializers(self, dataset, options):
+        return serializers.run(
+            options['serializers'] or serializers.PAGE_SIZES
+        )
+
+    def run_endpoints(self, dataset, options):
+        return run(
+            dataset,
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            only=options['only'],
+        )
+
+    def save(self, path, dataset, results):
+        report = {
+            'meta': {
+                'commit': get_commit(),
+                'created': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'dataset': dataset,
+            },
+            'results': results,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(f'Результаты сохранены в {path}')
+
+    def print_endpoints(self, results):
+        self.stdout.write(
+            f'{"сценарий":<22}{"p50, мс":>10}{"p95, мс":>10}{"p99, мс":>10}'
+            f'{"запросов":>10}{"КиБ":>10}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<22}{result["p50_ms"]:>10.2f}'
+                f'{result["p95_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+                f'{result["queries_per_request"]:>10.1f}'
+                f'{result["peak_alloc_kib"]:>10.1f}'
+            )
+
+    def print_serializers(self, results):
+        self.stdout.write(
+            f'{"список":<12}{"страница":>10}{"DRF, мкс":>12}'
+            f'{"быстрый, мкс":>14}{"ускорение":>11}{"JSON совпадает":>16}'
+        )
+        for name, sizes in results.items():
+            for page_size, result in sizes.items():
+                self.stdout.write(
+                    f'{name:<12}{page_size:>10}'
+                    f'{result["regular_us_per_item"]:>12.2f}'
+                    f'{result["fast_us_per_item"]:>14.2f}'
+                    f'{result["speedup"]:>11.2f}'
+                    f'{"да" if result["identical"] else "НЕТ":>16}'
+                )
+
+    def print_asgi(self, results):
+        self.stdout.write(
+            f'{"вьюхи":<10}{"запросов/с":>12}{"p50, мс":>10}{"p99, мс":>10}'
+            f'{"статусы":>12}'
+        )
+        for name, result in results.items():
+            statuses = ','.join(map(str, result['statuses']))
+            self.stdout.write(
+                f'{name:<10}{result["requests_per_s"]:>12.1f}'
+                f'{result["p50_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+                f'{statuses:>12}'
+            )
+
+    def print_sqlite(self, results):
+        self.stdout.write(
+            f'{"вариант":<10}{"чтений/с":>10}{"записей/с":>11}'
+            f'{"операций/с":>12}{"ошибок":>8}{"p50, мс":>10}{"p99, мс":>10}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<10}{result["reads_per_s"]:>10.1f}'
+                f'{result["writes_per_s"]:>11.1f}'
+                f'{result["ops_per_s"]:>12.1f}{result["errors"]:>8}'
+                f'{result["p50_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+            )
+
+    def print_changes(self, changes):
+        self.stdout.write('Изменение относительно предыдущего запуска, %:')
+        for name, change in changes.items():
+            values = ', '.join(
+                f'{key} {value:+.1f}' for key, value in change.items()
+            )
+            self.stdout.write(f'{name:<22}{values}')
@@ -1,20 +1,27 @@
-from csv import reader
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import os
+from time import perf_counter
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
+from api.management.csv_reader import parse_file, read_chunks
+from api.search import get_search_backend
 from api_yamdb.settings import BASE_DIR
 from reviews.models import (
-    Category, Comments, Genre, Review, Title, TitleGenres
+    Category, Comments, Genre, Review, TableVersion, Title, TitleGenres
 )
 
 
 User = get_user_model()
 
+DEFAULT_BATCH_SIZE = 1000
+
 
 def load_categories(row):
-    Category.objects.get_or_create(
+    return Category(
         id=row[0],
         name=row[1],
         slug=row[2]
@@ -22,7 +29,7 @@ def load_categories(row):
 
 
 def load_genres(row):
-    Genre.objects.get_or_create(
+    return Genre(
         id=row[0],
         name=row[1],
         slug=row[2]
@@ -30,16 +37,17 @@ def load_genres(row):
 
 
 def load_titles(row):
-    Title.objects.get_or_create(
+    return Title(
         id=row[0],
         name=row[1],
         year=row[2],
-        category_id=row[3]
+        category_id=row[3] or None,
+        description=row[4] if len(row) > 4 else None
     )
 
 
 def load_genre_titles(row):
-    TitleGenres.objects.get_or_create(
+    return TitleGenres(
         id=row[0],
         title_id=row[1],
         genre_id=row[2]
@@ -47,32 +55,28 @@ def load_genre_titles(row):
 
 
 def load_reviews(row):
-    title = Title.objects.get(id=row[1])
-    author = User.objects.get(id=row[3])
-    Review.objects.get_or_create(
+    return Review(
         id=row[0],
-        title=title,
+        title_id=row[1],
         text=row[2],
-        author=author,
+        author_id=row[3],
         score=row[4],
         pub_date=row[5]
     )
 
 
 def load_comments(row):
-    review = Review.objects.get(id=row[1])
-    author = User.objects.get(id=row[3])
-    Comments.objects.get_or_create(
+    return Comments(
         id=row[0],
-        review=review,
+        review_id=row[1],
         text=row[2],
-        author=author,
+        author_id=row[3],
         pub_date=row[4]
     )
 
 
 def load_users(row):
-    User.objects.get_or_create(
+    return User(
         id=row[0],
         username=row[1],
         email=row[2],
@@ -84,26 +88,195 @@ def load_users(row):
 
 
 files_functions = (
-    ('category.csv', load_categories),
-    ('genre.csv', load_genres),
-    ('titles.csv', load_titles),
-    ('genre_title.csv', load_genre_titles),
-    ('users.csv', load_users),
-    ('review.csv', load_reviews),
-    ('comments.csv', load_comments)
+    ('category.csv', Category, load_categories),
+    ('genre.csv', Genre, load_genres),
+    ('titles.csv', Title, load_titles),
+    ('genre_title.csv', TitleGenres, load_genre_titles),
+    ('users.csv', User, load_users),
+    ('review.csv', Review, load_reviews),
+    ('comments.csv', Comments, load_comments)
 )
 
+# Внешние ключи, которые проверяются по множествам id в памяти:
+# (поле модели, модель, на которую оно ссылается).
+foreign_keys = {
+    Title: (('category_id', Category),),
+    TitleGenres: (('title_id', Title), ('genre_id', Genre)),
+    Review: (('title_id', Title), ('author_id', User)),
+    Comments: (('review_id', Review), ('author_id', User)),
+}
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Отключает ``auto_now_add`` полей модели на время загрузки.
+
+    ``bulk_create`` заполняет такие поля текущим временем и затирает
+    даты из файла, например ``pub_date`` отзывов и комментариев.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def get_dependencies():
+    """Строит граф зависимостей файлов по внешним ключам моделей."""
+    model_files = {model: file for file, model, _ in files_functions}
+    return {
+        file: {
+            model_files[related]
+            for _, related in foreign_keys.get(model, ())
+        }
+        for file, model, _ in files_functions
+    }
+
 
 class Command(BaseCommand):
     help = 'Начало загрузки файлов'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной транзакции bulk_create.',
+        )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Очистить таблицы перед загрузкой '
+                 '(суперпользователи и персонал не удаляются).',
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать строки, которые уже есть в базе.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество процессов для разбора файлов. По умолчанию '
+                 'файлы читаются потоково пачками по --batch-size строк. '
+                 'При значении больше 1 каждый файл целиком разбирается '
+                 'в памяти параллельно с записью в базу: это быстрее, но '
+                 'требует памяти на весь файл.',
+        )
+
     def handle(self, *args, **options):
-        for file, function in files_functions:
-            file_path = os.path.join(BASE_DIR, "static/data", file)
-            with open(file_path, 'r', encoding='utf-8') as current_file:
-                content = reader(current_file)
-                next(content)
-                for row in content:
-                    function(row)
-            self.stdout.write(f'{file} загружен!')
+        if options['truncate']:
+            self.truncate()
+        if options['workers'] > 1:
+            self.load_parallel(options)
+        else:
+            self.load_sequential(options)
+        Title.objects.recalculate_rating()
+        TableVersion.objects.bump(
+            TableVersion.CATEGORIES, TableVersion.GENRES, TableVersion.TITLES
+        )
+        get_search_backend().rebuild()
         self.stdout.write('Загрузка завершена')
+
+    def truncate(self):
+        for _, model, _ in reversed(files_functions):
+            queryset = model.objects.all()
+            if model is User:
+                queryset = queryset.filter(is_staff=False, is_superuser=False)
+            queryset.delete()
+        self.stdout.write('Таблицы очищены')
+
+    def load_sequential(self, options):
+        known_ids = {}
+        for file, model, function in files_functions:
+            chunks = read_chunks(self.get_path(file), options['batch_size'])
+            self.load_file(file, chunks, model, function, known_ids, options)
+
+    def load_parallel(self, options):
+        """Разбирает файлы в пуле процессов и пишет их в базу по очереди.
+
+        Файл записывается, как только он разобран и записаны все файлы,
+        от которых он зависит. Запись идёт в одном потоке, поэтому каждая
+        таблица заполняется последовательно.
+        """
+        dependencies = get_dependencies()
+        loaders = {file: (model, function)
+                   for file, model, function in files_functions}
+        known_ids = {}
+        written = set()
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            parsed = {
+                file: pool.submit(
+                    parse_file, self.get_path(file), options['batch_size']
+                )
+                for file in loaders
+            }
+            while parsed:
+                ready = [
+                    file for file in parsed
+                    if dependencies[file] <= written
+                ]
+                done = [file for file in ready if parsed[file].done()]
+                file = (done or ready)[0]
+                model, function = loaders[file]
+                self.load_file(
+                    file, parsed.pop(file).result(), model, function,
+                    known_ids, options
+                )
+                written.add(file)
+
+    def get_path(self, file):
+        return os.path.join(BASE_DIR, 'static/data', file)
+
+    def get_known_ids(self, model, known_ids):
+        """Возвращает множество id модели, загружая его из базы один раз."""
+        if model not in known_ids:
+            known_ids[model] = set(
+                model.objects.values_list('id', flat=True).iterator()
+            )
+        return known_ids[model]
+
+    def load_file(self, file, chunks, model, function, known_ids, options):
+        checks = [
+            (field, self.get_known_ids(related, known_ids))
+            for field, related in foreign_keys.get(model, ())
+        ]
+        loaded_ids = self.get_known_ids(model, known_ids)
+        loaded = skipped = 0
+        started = perf_counter()
+        for chunk in chunks:
+            objects = []
+            for row in chunk:
+                obj = function(row)
+                if all(
+                    getattr(obj, field) is None
+                    or int(getattr(obj, field)) in ids
+                    for field, ids in checks
+                ):
+                    objects.append(obj)
+                else:
+                    skipped += 1
+            with transaction.atomic(), keep_auto_now_add(model):
+                model.objects.bulk_create(
+                    objects, ignore_conflicts=options['ignore_conflicts']
+                )
+            loaded_ids.update(int(obj.id) for obj in objects)
+            loaded += len(objects)
+        elapsed = perf_counter() - started
+        rate = loaded / elapsed if elapsed else loaded
+        self.stdout.write(
+            f'{file} загружен: {loaded} строк за {elapsed:.2f} с '
+            f'({rate:.0f} строк/с)'
+        )
+        if skipped:
+            self.stdout.write(
+                f'{file}: пропущено строк с несуществующими связями: '
+                f'{skipped}'
+            )
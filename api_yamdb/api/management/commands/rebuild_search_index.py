@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестроение поискового индекса произведений'
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write('Поисковый индекс перестроен')
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт хранимых рейтингов произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=0,
+            help='Количество произведений в одном UPDATE (0 - все сразу).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        titles = Title.objects.order_by('pk')
+        if not batch_size:
+            with transaction.atomic():
+                updated = titles.recalculate_rating()
+            self.stdout.write(f'Пересчитано произведений: {updated}')
+            return
+        updated = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                titles.filter(pk__gt=last_pk).values_list('pk', flat=True)[
+                    :batch_size
+                ]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                updated += Title.objects.filter(
+                    pk__in=pks
+                ).recalculate_rating()
+            last_pk = pks[-1]
+        self.stdout.write(f'Пересчитано произведений: {updated}')
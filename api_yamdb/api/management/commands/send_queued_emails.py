@@ -0,0 +1,48 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from api.mail import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.MAIL_QUEUE_BATCH_SIZE,
+            help='Количество писем, отправляемых за один проход.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новых писем.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах между проверками пустой очереди.',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        with get_connection() as email_connection:
+            while True:
+                sent, failed = send_queued_emails(
+                    options['batch_size'], email_connection
+                )
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    continue
+                if not options['loop']:
+                    break
+                sleep(options['interval'])
+        self.stdout.write(
+            f'Отправлено писем: {total_sent}, с ошибкой: {total_failed}'
+        )
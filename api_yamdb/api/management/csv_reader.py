@@ -0,0 +1,24 @@
+"""Чтение CSV-файлов для команды loadcsv.
+
+Модуль не импортирует Django, поэтому его функции можно выполнять
+в отдельных процессах пула независимо от способа их запуска.
+"""
+from csv import reader
+from itertools import islice
+
+
+def read_chunks(file_path, batch_size):
+    """Построчно читает CSV-файл и отдаёт строки пачками."""
+    with open(file_path, 'r', encoding='utf-8') as current_file:
+        content = reader(current_file)
+        next(content)
+        while True:
+            chunk = list(islice(content, batch_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def parse_file(file_path, batch_size):
+    """Целиком разбирает CSV-файл в список пачек строк."""
+    return list(read_chunks(file_path, batch_size))
@@ -0,0 +1,190 @@
+"""Метрики запросов к API в памяти процесса.
+
+Для каждого маршрута (``title-list``, ``review-detail``, ``users-me`` и
+т.д.) собираются гистограммы числа SQL-запросов, времени в БД, времени
+сериализации и общего времени ответа. Гистограммы отдаются в текстовом
+формате Prometheus. Вместе с ними отдаётся состояние пулов соединений
+с базой, если пул включён.
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+from api_yamdb.backends.sqlite.pool import pools
+
+current_recorder = ContextVar('current_recorder', default=None)
+
+
+def log_linear_bounds(start, stop, steps_per_doubling=4):
+    """Границы корзин: каждое удвоение делится на равные шаги."""
+    bounds = []
+    base = start
+    while base < stop:
+        step = base / steps_per_doubling
+        bounds.extend(base + step * idx for idx in range(steps_per_doubling))
+        base *= 2
+    bounds.append(stop)
+    return tuple(round(bound, 6) for bound in bounds)
+
+
+SECONDS_BOUNDS = log_linear_bounds(0.0005, 32)
+QUERIES_BOUNDS = log_linear_bounds(1, 1024, steps_per_doubling=1)
+
+
+class Histogram:
+    """Гистограмма с фиксированными логарифмически-линейными корзинами."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+            )
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.total}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum:g}')
+        lines.append(f'{name}_count{{{labels}}} {self.total}')
+        return lines
+
+
+METRICS = (
+    ('yamdb_request_queries', 'Количество SQL-запросов', QUERIES_BOUNDS),
+    ('yamdb_request_db_seconds', 'Время выполнения SQL-запросов',
+     SECONDS_BOUNDS),
+    ('yamdb_request_serializer_seconds', 'Время сериализации',
+     SECONDS_BOUNDS),
+    ('yamdb_request_duration_seconds', 'Общее время ответа',
+     SECONDS_BOUNDS),
+)
+
+
+class MetricsRegistry:
+    """Потокобезопасное хранилище гистограмм по маршрутам."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = Lock()
+
+    def observe(self, route, queries, db_seconds, serializer_seconds,
+                seconds):
+        values = (queries, db_seconds, serializer_seconds, seconds)
+        with self._lock:
+            histograms = self._routes.get(route)
+            if histograms is None:
+                histograms = self._routes[route] = [
+                    Histogram(bounds) for _, _, bounds in METRICS
+                ]
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            routes = sorted(self._routes.items())
+            for idx, (name, description, _) in enumerate(METRICS):
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for route, histograms in routes:
+                    lines.extend(
+                        histograms[idx].render(name, f'route="{route}"')
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+POOL_METRICS = (
+    ('yamdb_db_pool_max_size', 'gauge', 'Размер пула соединений',
+     'max_size'),
+    ('yamdb_db_pool_in_use', 'gauge', 'Выданные соединения', 'in_use'),
+    ('yamdb_db_pool_idle', 'gauge', 'Свободные соединения', 'idle'),
+    ('yamdb_db_pool_waits_total', 'counter',
+     'Запросы соединения, которым пришлось ждать', 'waits'),
+    ('yamdb_db_pool_wait_seconds_total', 'counter',
+     'Суммарное время ожидания соединения', 'wait_seconds'),
+    ('yamdb_db_pool_timeouts_total', 'counter',
+     'Отказы по истечении времени ожидания', 'timeouts'),
+)
+
+
+def render_pools():
+    """Состояние пулов соединений в текстовом формате Prometheus."""
+    stats = {alias: pool.stats() for alias, pool in sorted(pools.items())}
+    if not stats:
+        return ''
+    lines = []
+    for name, kind, description, key in POOL_METRICS:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for alias, values in stats.items():
+            lines.append(f'{name}{{alias="{alias}"}} {values[key]:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class RequestRecorder:
+    """Счётчики одного запроса; используется как execute_wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0
+        self.serializer_seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += perf_counter() - started
+            self.queries += 1
+
+
+def record_query(execute, sql, params, many, context):
+    """Обёртка выполнения SQL, передающая запрос счётчикам запроса."""
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def timed_representation(to_representation):
+    """Добавляет время сериализации к счётчикам текущего запроса."""
+    @wraps(to_representation)
+    def wrapper(*args, **kwargs):
+        recorder = current_recorder.get()
+        if recorder is None:
+            return to_representation(*args, **kwargs)
+        started = perf_counter()
+        try:
+            return to_representation(*args, **kwargs)
+        finally:
+            recorder.serializer_seconds += perf_counter() - started
+    return wrapper
+
+
+class SerializerTimingMixin:
+    """Учитывает время сериализации ответа вьюсета в метриках."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        serializer.to_representation = timed_representation(
+            serializer.to_representation
+        )
+        return serializer
@@ -0,0 +1,64 @@
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import RequestRecorder, current_recorder, registry
+
+
+class MetricsMiddleware:
+    """Собирает метрики запросов по имени маршрута.
+
+    SQL-запросы считаются обёрткой ``record_query``, которая ставится на
+    все подключения при их создании, поэтому DEBUG для этого не нужен.
+    Счётчики запроса хранятся в контекстной переменной и видны и в
+    потоках, где под ASGI выполняются вьюхи.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        recorder = RequestRecorder()
+        token = current_recorder.set(recorder)
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.observe(request, recorder, started)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        recorder = RequestRecorder()
+        token = current_recorder.set(recorder)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.observe(request, recorder, started)
+        return response
+
+    def observe(self, request, recorder, started):
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None and resolver_match.url_name:
+            registry.observe(
+                resolver_match.url_name,
+                recorder.queries,
+                recorder.db_seconds,
+                recorder.serializer_seconds,
+                perf_counter() - started,
+            )
@@ -0,0 +1,291 @@
+"""Общие примеси для вьюсетов каталога."""
+from hashlib import md5
+from itertools import islice
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from reviews.models import TableVersion
+
+from .metrics import timed_representation
+from .renderers import FastJSONRenderer
+from .replicas import (
+    choose_replica,
+    is_pinned,
+    pin_to_primary,
+    reset_read_alias,
+    set_read_alias,
+)
+
+
+class EarlyResponse(Exception):
+    """Прерывает обработку запроса готовым ответом."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ReplicaRoutingMixin:
+    """Безопасные запросы читают с реплики, запись закрепляет автора.
+
+    Примесь должна стоять первой, чтобы запросы остальных примесей в
+    ``initial`` тоже шли на реплику. Алиас выставляется в ``initial``,
+    когда пользователь уже известен, а сбрасывается в ``dispatch`` при
+    любом исходе запроса: ``finalize_response`` не вызывается, если вьюха
+    упала с исключением, которое DRF не обрабатывает.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        self._read_alias_token = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._read_alias_token is not None:
+                reset_read_alias(self._read_alias_token)
+                self._read_alias_token = None
+
+    def initial(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS and not is_pinned(request.user):
+            alias = choose_replica()
+            if alias is not None:
+                self._read_alias_token = set_read_alias(alias)
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return response
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы по версиям таблиц каталога.
+
+    ETag и Last-Modified вычисляются по счётчикам ``TableVersion`` из
+    ``version_tables``, поэтому при совпадении ``If-None-Match`` или
+    ``If-Modified-Since`` ответ 304 отдаётся одним запросом к таблице
+    версий, без выборки строк и сериализации.
+    """
+
+    version_tables = ()
+
+    def get_versions(self):
+        if not hasattr(self, '_versions'):
+            self._versions = TableVersion.objects.get_versions(
+                *self.version_tables
+            )
+        return self._versions
+
+    def get_etag(self):
+        versions = self.get_versions()
+        return quote_etag('-'.join(
+            [self.request.accepted_renderer.format]
+            + [
+                f'{versions[table][0]}.{versions[table][1].timestamp():.6f}'
+                for table in self.version_tables
+            ]
+        ))
+
+    def get_last_modified(self):
+        return int(max(
+            updated_at for _, updated_at in self.get_versions().values()
+        ).timestamp())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action not in ('list', 'retrieve'):
+            return
+        response = get_conditional_response(
+            request,
+            etag=self.get_etag(),
+            last_modified=self.get_last_modified(),
+        )
+        if response is not None:
+            raise EarlyResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if hasattr(self, '_versions') and response.status_code in (200, 304):
+            response['ETag'] = self.get_etag()
+            response['Last-Modified'] = http_date(self.get_last_modified())
+        return response
+
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """Кэш готовых ответов списка, вытесняемых по версиям таблиц.
+
+    Ключ содержит ETag (формат ответа и версии таблиц), путь и
+    отсортированные параметры запроса. Любая запись в таблицы из
+    ``version_tables`` меняет версию, и старые ключи больше не
+    используются; из кэша они вытесняются по LRU или по таймауту.
+    Ответы браузируемого API не кэшируются: в них есть данные
+    пользователя.
+    """
+
+    def get_response_cache_key(self, request):
+        if (not settings.RESPONSE_CACHE_ENABLED or self.action != 'list'
+                or request.accepted_renderer.format == 'api'):
+            return None
+        query = urlencode(sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+            if value != ''
+        ))
+        digest = md5(
+            f'{request.path}?{query}'.encode(), usedforsecurity=False
+        ).hexdigest()
+        return f'response:{self.basename}:{self.get_etag()}:{digest}'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._response_cache_key = self.get_response_cache_key(request)
+        if self._response_cache_key is None:
+            return
+        cached = caches[settings.RESPONSE_CACHE_ALIAS].get(
+            self._response_cache_key
+        )
+        if cached is not None:
+            content, content_type = cached
+            self._response_cache_key = None
+            raise EarlyResponse(
+                HttpResponse(content, content_type=content_type)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        cache_key = getattr(self, '_response_cache_key', None)
+        if (cache_key is not None and isinstance(response, Response)
+                and response.status_code == 200):
+            response.render()
+            caches[settings.RESPONSE_CACHE_ALIAS].set(
+                cache_key, (response.content, response['Content-Type'])
+            )
+        return response
+
+
+class FastListMixin:
+    """Список через сериализатор ``fast_serializer_class`` из строк
+    ``values()`` вместо экземпляров моделей и ``serializer_class``.
+
+    Списки от ``JSON_STREAM_MIN_ITEMS`` объектов отдаются в JSON потоком:
+    объекты сериализуются и кодируются частями по
+    ``JSON_STREAM_CHUNK_SIZE``.
+    """
+
+    fast_serializer_class = None
+
+    def get_fast_serializer(self):
+        return self.fast_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        if (self.fast_serializer_class is None
+                or not settings.FAST_SERIALIZERS_ENABLED):
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_fast_serializer()
+        rows = serializer.get_rows(self.filter_queryset(self.get_queryset()))
+        serialize = timed_representation(serializer.serialize)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            if self.can_stream():
+                return self.stream_response(
+                    serializer, rows.iterator(settings.JSON_STREAM_CHUNK_SIZE)
+                )
+            return Response(serialize(list(rows)))
+        if self.can_stream() and len(page) >= settings.JSON_STREAM_MIN_ITEMS:
+            return self.stream_response(
+                serializer, page, self.get_paginated_response([]).data
+            )
+        return self.get_paginated_response(serialize(page))
+
+    def can_stream(self):
+        renderer = self.request.accepted_renderer
+        return isinstance(renderer, FastJSONRenderer) and not (
+            renderer.get_indent(self.request.accepted_media_type, {})
+        )
+
+    def stream_response(self, serializer, rows, envelope=None):
+        renderer = self.request.accepted_renderer
+        chunk_size = settings.JSON_STREAM_CHUNK_SIZE
+
+        def items():
+            iterator = iter(rows)
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    return
+                yield from serializer.serialize(chunk)
+
+        return StreamingHttpResponse(
+            renderer.render_stream(
+                items(), envelope=envelope, chunk_size=chunk_size
+            ),
+            content_type=renderer.media_type,
+        )
+
+
+class SparseFieldsMixin:
+    """Выбор полей ответа параметром ``fields`` в GET-запросах.
+
+    Допустимые поля и нужные для них поля модели берутся из
+    ``fast_serializer_class.lookups``. Лишние поля не попадают ни в
+    ответ, ни в SELECT: список выбирается через ``values()`` быстрым
+    сериализатором, объект - через ``only()``.
+    """
+
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+        self._requested_fields = None
+        value = self.request.query_params.get(self.fields_query_param)
+        if self.request.method == 'GET' and value:
+            fields = [name.strip() for name in value.split(',')]
+            unknown = set(fields) - set(self.fast_serializer_class.lookups)
+            if unknown:
+                raise ValidationError({
+                    self.fields_query_param:
+                        f'Неизвестные поля: {", ".join(sorted(unknown))}'
+                })
+            self._requested_fields = fields
+        return self._requested_fields
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        lookups = self.fast_serializer_class(fields).get_lookups()
+        relations = {
+            lookup.split('__')[0] for lookup in lookups if '__' in lookup
+        }
+        return queryset.select_related(None).select_related(
+            *relations
+        ).only(*lookups)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_fast_serializer(self):
+        return self.fast_serializer_class(self.get_requested_fields())
@@ -0,0 +1,131 @@
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from urllib import parse
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PageSizePagination(PageNumberPagination):
+    """Постраничная пагинация с размером страницы из ``page_size``.
+
+    Размер страницы ограничен настройкой ``MAX_PAGE_SIZE``.
+    """
+
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.MAX_PAGE_SIZE
+
+
+class PubDateCursorPagination(PageSizePagination):
+    """Пагинация с необязательным курсором по дате публикации.
+
+    Без параметра ``cursor`` работает как обычная постраничная пагинация.
+    С параметром ``cursor`` (первая страница - ``?cursor=``) страницы
+    выбираются по ключу ``(pub_date, id)`` без COUNT и OFFSET, поэтому
+    время выборки не зависит от глубины страницы.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+    ordering = ('pub_date', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.page_query_param
+        )
+        reverse, position = self.decode_cursor(request)
+        date_field, id_field = self.ordering
+        if reverse:
+            queryset = queryset.order_by(f'-{date_field}', f'-{id_field}')
+        else:
+            queryset = queryset.order_by(date_field, id_field)
+        if position is not None:
+            pub_date, pk = position
+            lookup = 'lt' if reverse else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__{lookup}': pub_date})
+                | Q(**{date_field: pub_date, f'{id_field}__{lookup}': pk})
+            )
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def decode_cursor(self, request):
+        """Возвращает направление и позицию ``(pub_date, id)`` курсора."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            pub_date = parse_datetime(tokens['p'][0])
+            pk = int(tokens['i'][0])
+        except (BinasciiError, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, (pub_date, pk)
+
+    def encode_cursor(self, reverse, instance):
+        date_field, id_field = self.ordering
+        if isinstance(instance, dict):
+            pub_date, pk = instance[date_field], instance[id_field]
+        else:
+            pub_date = getattr(instance, date_field)
+            pk = getattr(instance, id_field)
+        tokens = {'p': pub_date.isoformat(), 'i': pk}
+        if reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
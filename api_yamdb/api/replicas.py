@@ -0,0 +1,82 @@
+"""Чтение с реплик базы и закрепление пользователя за основной базой.
+
+Алиас базы для чтения хранится в контекстной переменной: его выставляет
+``ReplicaRoutingMixin`` на время обработки безопасного запроса, а
+``ReplicaRouter`` отдаёт его Django при выборе базы для чтения. Вне
+таких запросов и при любой записи используется основная база.
+
+После успешной записи пользователь на ``REPLICA_PIN_SECONDS`` читает
+только с основной базы, чтобы сразу видеть свои изменения, даже если
+реплика ещё не догнала основную базу. Отметка хранится в кэше
+``REPLICA_PIN_CACHE_ALIAS``; при нескольких процессах он должен быть
+общим.
+"""
+from contextvars import ContextVar
+from random import choice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def get_pin_key(user):
+    return f'replica:pin:{user.pk}'
+
+
+def pin_to_primary(user):
+    if user.is_authenticated:
+        caches[settings.REPLICA_PIN_CACHE_ALIAS].set(
+            get_pin_key(user), True, settings.REPLICA_PIN_SECONDS
+        )
+
+
+def is_pinned(user):
+    return user.is_authenticated and caches[
+        settings.REPLICA_PIN_CACHE_ALIAS
+    ].get(get_pin_key(user), False)
+
+
+def choose_replica():
+    """Возвращает случайную реплику или ``None``, если их нет."""
+    if settings.DATABASE_REPLICAS:
+        return choice(settings.DATABASE_REPLICAS)
+    return None
+
+
+def set_read_alias(alias):
+    return _read_alias.set(alias)
+
+
+def reset_read_alias(token):
+    _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Направляет чтение на выбранную реплику, а запись - на основную.
+
+    Модели из ``PRIMARY_MODELS`` всегда читаются с основной базы: по
+    версиям таблиц строятся ETag и ключи кэша, и отстающая реплика
+    отдала бы устаревшие версии.
+    """
+
+    PRIMARY_MODELS = ('reviews.tableversion',)
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower in self.PRIMARY_MODELS:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get('instance')
+        if (instance is not None
+                and instance._state.db in settings.DATABASE_REPLICAS):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,131 @@
+"""Полнотекстовый поиск произведений.
+
+Бэкенд задаётся настройкой ``TITLE_SEARCH_BACKEND``. Если она не задана,
+на SQLite используется индекс FTS5, на остальных СУБД - поиск без
+индекса через ``icontains``.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+from reviews.models import Title
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+class BaseSearchBackend:
+    """Интерфейс бэкенда поиска произведений."""
+
+    def index(self, titles):
+        """Добавляет или обновляет произведения в индексе."""
+
+    def remove(self, title_ids):
+        """Удаляет произведения из индекса."""
+
+    def rebuild(self):
+        """Перестраивает индекс по таблице произведений."""
+
+    def search(self, queryset, query):
+        """Фильтрует queryset по запросу и сортирует по релевантности."""
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Поиск без индекса: совпадения в названии выше, чем в описании."""
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        in_name = Q()
+        in_text = Q()
+        for term in terms:
+            in_name &= Q(name__icontains=term)
+            in_text &= Q(name__icontains=term) | Q(description__icontains=term)
+        return queryset.filter(in_text).annotate(
+            search_rank=Case(
+                When(in_name, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        ).order_by('search_rank', 'name')
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Инвертированный индекс FTS5 с ранжированием bm25.
+
+    Таблица индекса создаётся миграцией reviews 0004. Каждое слово
+    запроса ищется по префиксу, совпадение в названии весит больше,
+    чем в описании.
+    """
+
+    table = 'reviews_title_fts'
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def index(self, titles):
+        rows = [
+            (title.pk, title.name, title.description or '')
+            for title in titles
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(row[0],) for row in rows],
+            )
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, title_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(title_id,) for title_id in title_ids],
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, name, description) '
+                f'SELECT id, name, COALESCE(description, \'\') '
+                f'FROM {Title._meta.db_table}'
+            )
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            tables=[self.table],
+            where=[
+                f'{self.table}.rowid = {Title._meta.db_table}.id',
+                f'{self.table} MATCH %s',
+            ],
+            params=[match],
+            select={
+                'search_rank': (
+                    f'bm25({self.table}, {self.name_weight}, '
+                    f'{self.description_weight})'
+                ),
+            },
+        ).order_by('search_rank', 'name')
+
+
+def get_search_backend():
+    if settings.TITLE_SEARCH_BACKEND:
+        return import_string(settings.TITLE_SEARCH_BACKEND)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    return SimpleSearchBackend()
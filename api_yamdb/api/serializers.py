@@ -1,13 +1,38 @@
+from collections import defaultdict
+
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from reviews.constants import (
     EMAIL_LENGTH,
     MAX_TITLE_SCORE,
     MIN_TITLE_SCORE,
 )
-from reviews.models import Category, Comments, Genre, Review, Title, User
+from reviews.models import (
+    Category,
+    Comments,
+    Genre,
+    Review,
+    Title,
+    TitleGenres,
+    User,
+)
 from reviews.validators import validate_username
 
+from .bulk import bulk_create_with_ids
+from .permissions import IsAdmin
+
+
+class SparseFieldsMixin:
+    """Оставляет в ответе только поля, переданные в ``fields``."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 
 class CategorySerializer(serializers.ModelSerializer):
     """Сериализатор для категории."""
@@ -25,7 +50,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Класс сериализатора для произведений."""
 
     category = CategorySerializer(read_only=True)
@@ -34,10 +59,18 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id',
+            'category',
+            'genre',
+            'rating',
+            'name',
+            'year',
+            'description',
+        )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Настройки сериализатора модели Review."""
 
     author = serializers.SlugRelatedField(
@@ -60,7 +93,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         title_id = self.context['view'].kwargs['title_id']
 
         if self.context['request'].method == 'POST':
-            if author.reviews.filter(title=title_id):
+            if author.reviews.filter(title=title_id).exists():
                 raise serializers.ValidationError(
                     'Вы уже оставили отзыв на это произведение.'
                 )
@@ -68,7 +101,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Настройки сериализатора модели Comment."""
 
     author = serializers.SlugRelatedField(
@@ -83,6 +116,299 @@ class CommentsSerializer(serializers.ModelSerializer):
         model = Comments
 
 
+class BulkListSerializer(serializers.ListSerializer):
+    """Список объектов для массового создания.
+
+    После проверки каждого объекта вызывает ``validate_batch`` дочернего
+    сериализатора для прошедших проверку объектов: он проверяет их
+    запросами по множествам и возвращает ошибки по объектам. Запись
+    выполняет ``child.bulk_create``.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages['not_a_list'].format(
+                input_type=type(data).__name__
+            )
+        elif not data and not self.allow_empty:
+            message = self.error_messages['empty']
+        elif len(data) > settings.BULK_MAX_ITEMS:
+            message = (
+                f'Не больше {settings.BULK_MAX_ITEMS} объектов за запрос.'
+            )
+        else:
+            message = None
+        if message is not None:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message]
+            })
+        items = []
+        errors = []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+        batch_errors = iter(self.child.validate_batch(items))
+        errors = [
+            item_errors or next(batch_errors) for item_errors in errors
+        ]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        return self.child.bulk_create(validated_data)
+
+
+class BulkAuthoredSerializer(serializers.ModelSerializer):
+    """Основа сериализаторов массового создания отзывов и комментариев.
+
+    Автор по умолчанию - текущий пользователь; администратор может
+    указать другого автора по ``username``.
+    """
+
+    author = serializers.CharField(source='author.username', required=False)
+
+    def validate_batch(self, items):
+        errors = [{} for _ in items]
+        request = self.context['request']
+        usernames = {
+            item['author']['username'] for item in items if 'author' in item
+        }
+        if usernames and not IsAdmin().has_permission(request, None):
+            usernames = set()
+            for item, item_errors in zip(items, errors):
+                if 'author' in item:
+                    item_errors['author'] = [
+                        'Указать автора может только администратор.'
+                    ]
+        authors = {
+            user.username: user
+            for user in User.objects.filter(username__in=usernames)
+        }
+        for item, item_errors in zip(items, errors):
+            username = item.get('author', {}).get('username')
+            if username is None:
+                item['author'] = request.user
+            elif username in authors:
+                item['author'] = authors[username]
+            elif not item_errors:
+                item_errors['author'] = ['Пользователь не найден.']
+        return errors
+
+
+class ReviewBulkSerializer(BulkAuthoredSerializer):
+    """Отзыв в запросе массового создания."""
+
+    score = serializers.IntegerField(
+        min_value=MIN_TITLE_SCORE, max_value=MAX_TITLE_SCORE
+    )
+    title = serializers.IntegerField(source='title_id')
+
+    class Meta:
+        fields = ('id', 'author', 'score', 'title', 'text', 'pub_date')
+        model = Review
+        list_serializer_class = BulkListSerializer
+
+    def validate_batch(self, items):
+        errors = super().validate_batch(items)
+        title_ids = {item['title_id'] for item in items}
+        known_titles = set(
+            Title.objects.filter(pk__in=title_ids).values_list(
+                'pk', flat=True
+            )
+        )
+        authors = {
+            item['author'].pk for item in items
+            if isinstance(item['author'], User)
+        }
+        reviewed = set(
+            Review.objects.filter(
+                author__in=authors, title__in=known_titles
+            ).values_list('author_id', 'title_id')
+        )
+        for item, item_errors in zip(items, errors):
+            if item['title_id'] not in known_titles:
+                item_errors['title'] = ['Произведение не найдено.']
+            if item_errors:
+                continue
+            pair = (item['author'].pk, item['title_id'])
+            if pair in reviewed:
+                item_errors['non_field_errors'] = [
+                    'Автор уже оставил отзыв на это произведение.'
+                ]
+            reviewed.add(pair)
+        return errors
+
+    def bulk_create(self, items):
+        reviews = bulk_create_with_ids(Review, [
+            Review(**item) for item in items
+        ])
+        ratings = defaultdict(lambda: [0, 0])
+        for review in reviews:
+            ratings[review.title_id][0] += review.score
+            ratings[review.title_id][1] += 1
+        Title.objects.add_to_ratings(ratings)
+        return reviews
+
+
+class CommentsBulkSerializer(BulkAuthoredSerializer):
+    """Комментарий в запросе массового создания."""
+
+    review = serializers.IntegerField(source='review_id')
+
+    class Meta:
+        fields = ('id', 'author', 'review', 'text', 'pub_date')
+        model = Comments
+        list_serializer_class = BulkListSerializer
+
+    def validate_batch(self, items):
+        errors = super().validate_batch(items)
+        known_reviews = set(
+            Review.objects.filter(
+                pk__in={item['review_id'] for item in items}
+            ).values_list('pk', flat=True)
+        )
+        for item, item_errors in zip(items, errors):
+            if item['review_id'] not in known_reviews:
+                item_errors['review'] = ['Отзыв не найден.']
+        return errors
+
+    def bulk_create(self, items):
+        return bulk_create_with_ids(Comments, [
+            Comments(**item) for item in items
+        ])
+
+
+def get_slug_ids(model, slugs):
+    """Словарь ``{слаг: id}`` для найденных объектов ``model``."""
+    return dict(
+        model.objects.filter(slug__in=slugs).values_list('slug', 'pk')
+    )
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """Произведение в запросе массового создания и изменения.
+
+    Объект без ``id`` или с ``id``, которого нет в базе, создаётся, и для
+    него обязательны ``name``, ``year`` и ``category``. Объект с ``id``
+    существующего произведения изменяется: меняются только переданные
+    поля, ``genre`` заменяет список жанров целиком.
+    """
+
+    id = serializers.IntegerField(min_value=1, required=False)
+    category = serializers.SlugField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), required=False
+    )
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'description', 'category', 'genre')
+        model = Title
+        list_serializer_class = BulkListSerializer
+        extra_kwargs = {
+            'name': {'required': False},
+            'year': {'required': False},
+        }
+
+    def validate_batch(self, items):
+        categories = get_slug_ids(Category, {
+            item['category'] for item in items if 'category' in item
+        })
+        genres = get_slug_ids(Genre, {
+            slug for item in items for slug in item.get('genre', ())
+        })
+        self.existing_ids = set(Title.objects.filter(
+            pk__in={item['id'] for item in items if 'id' in item}
+        ).values_list('pk', flat=True))
+        seen_ids = set()
+        return [
+            self.validate_item(item, seen_ids)
+            | self.resolve_slugs(item, categories, genres)
+            for item in items
+        ]
+
+    def validate_item(self, item, seen_ids):
+        """Ошибки ``id`` и обязательных полей нового произведения."""
+        errors = {}
+        if 'id' in item:
+            if item['id'] in seen_ids:
+                errors['id'] = ['Произведение указано дважды.']
+            seen_ids.add(item['id'])
+        if item.get('id') not in self.existing_ids:
+            for field in ('name', 'year', 'category'):
+                if field not in item:
+                    errors[field] = ['Обязательное поле.']
+        return errors
+
+    @staticmethod
+    def resolve_slugs(item, categories, genres):
+        """Заменяет слаги категории и жанров на id и возвращает ошибки."""
+        errors = {}
+        if 'category' in item:
+            if item['category'] in categories:
+                item['category_id'] = categories[item.pop('category')]
+            else:
+                errors['category'] = ['Категория не найдена.']
+        unknown = set(item.get('genre', ())) - set(genres)
+        if unknown:
+            errors['genre'] = [
+                f'Жанры не найдены: {", ".join(sorted(unknown))}.'
+            ]
+        elif 'genre' in item:
+            item['genre'] = [genres[slug] for slug in item['genre']]
+        return errors
+
+    def bulk_create(self, items):
+        """Записывает произведения и возвращает их в порядке запроса."""
+        existing = Title.objects.in_bulk(self.existing_ids)
+        titles = []
+        created_with_id = []
+        created = []
+        updated_fields = set()
+        genres = []
+        for item in items:
+            genre_ids = item.pop('genre', None)
+            title = existing.get(item.get('id'))
+            if title is None:
+                title = Title(**item)
+                (created if title.pk is None else created_with_id).append(
+                    title
+                )
+            else:
+                for field, value in item.items():
+                    setattr(title, field, value)
+                updated_fields.update(set(item) - {'id'})
+            titles.append(title)
+            if genre_ids is not None:
+                genres.append((title, genre_ids))
+        Title.objects.bulk_create(
+            created_with_id, batch_size=settings.BULK_BATCH_SIZE
+        )
+        bulk_create_with_ids(Title, created)
+        if updated_fields:
+            Title.objects.bulk_update(
+                [title for title in titles if title.pk in existing],
+                updated_fields,
+                batch_size=settings.BULK_BATCH_SIZE,
+            )
+        TitleGenres.objects.filter(
+            title__in=[title.pk for title, _ in genres]
+        ).delete()
+        TitleGenres.objects.bulk_create(
+            [
+                TitleGenres(title_id=title.pk, genre_id=genre_id)
+                for title, genre_ids in genres
+                for genre_id in dict.fromkeys(genre_ids)
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        self.created_count = len(created) + len(created_with_id)
+        return titles
+
+
 class SignUpSerializer(serializers.ModelSerializer):
     username = serializers.CharField(
         validators=[validate_username],
@@ -0,0 +1,68 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, TableVersion, Title
+
+from .autocomplete import autocomplete_index
+from .metrics import record_query
+from .search import get_search_backend
+
+AUTOCOMPLETE_MODELS = {
+    Category: 'categories',
+    Genre: 'genres',
+    Title: 'titles',
+}
+
+VERSIONED_MODELS = {
+    Category: TableVersion.CATEGORIES,
+    Genre: TableVersion.GENRES,
+    Title: TableVersion.TITLES,
+    Title.genre.through: TableVersion.TITLES,
+}
+
+
+def bump_table_version(sender, using, **kwargs):
+    TableVersion.objects.db_manager(using).bump(VERSIONED_MODELS[sender])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genres_version(sender, action, using, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        TableVersion.objects.db_manager(using).bump(TableVersion.TITLES)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Title)
+def remove_title(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+def update_autocomplete(sender, instance, **kwargs):
+    autocomplete_index.update(AUTOCOMPLETE_MODELS[sender], instance)
+
+
+def remove_from_autocomplete(sender, instance, **kwargs):
+    autocomplete_index.remove(AUTOCOMPLETE_MODELS[sender], instance.pk)
+
+
+@receiver(connection_created)
+def add_metrics_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Обработчики подключаются только к своим моделям: обработчик post_delete
+# без sender запрещает Django удалять каскадом одним DELETE
+# (Collector.can_fast_delete) строки любых моделей.
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_table_version, sender=model)
+    post_delete.connect(bump_table_version, sender=model)
+
+for model in AUTOCOMPLETE_MODELS:
+    post_save.connect(update_autocomplete, sender=model)
+    post_delete.connect(remove_from_autocomplete, sender=model)
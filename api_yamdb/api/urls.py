@@ -4,10 +4,16 @@ from rest_framework.routers import DefaultRouter  # type: ignore
 from api.views import (
     APIGetToken,
     APISignup,
+    AutocompleteView,
     CategoryViewSet,
+    CommentsBulkCreateView,
     CommentsViewSet,
+    ExportView,
     GenreViewSet,
+    MetricsView,
+    ReviewBulkCreateView,
     ReviewViewSet,
+    TitleBulkView,
     TitleViewSet,
     UserViewSet,
 )
@@ -36,6 +42,30 @@ urlpatterns = [
         include(
             [
                 path('auth/', include(auth_urls)),
+                path('metrics/', MetricsView.as_view(), name='metrics'),
+                path(
+                    'autocomplete/',
+                    AutocompleteView.as_view(),
+                    name='autocomplete',
+                ),
+                path(
+                    'export/<str:table>.<str:extension>',
+                    ExportView.as_view(),
+                    name='export',
+                ),
+                path(
+                    'titles/bulk/', TitleBulkView.as_view(), name='title-bulk'
+                ),
+                path(
+                    'reviews/bulk/',
+                    ReviewBulkCreateView.as_view(),
+                    name='review-bulk',
+                ),
+                path(
+                    'comments/bulk/',
+                    CommentsBulkCreateView.as_view(),
+                    name='comment-bulk',
+                ),
                 path('', include(router_v1.urls)),
             ]
         ),
@@ -1,6 +1,13 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import EmailMessage
-from django.db.models import Avg
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
@@ -11,16 +18,45 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Comments, Genre, Review, Title, User
+from reviews.models import (
+    Category,
+    Comments,
+    Genre,
+    Review,
+    TableVersion,
+    Title,
+    User,
+)
 
-from .filters import TitleFilterSet
+from .authentication import user_cache
+from .autocomplete import KINDS, autocomplete_index
+from .export import EXPORTS, FORMATS, export, spool
+from .fast_serializers import (
+    CommentsFastSerializer,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
+from .filters import TitleFilterSet, TitleSearchFilter
+from .mail import get_mail_queue
+from .metrics import SerializerTimingMixin, registry, render_pools
+from .mixins import (
+    FastListMixin,
+    ReplicaRoutingMixin,
+    ResponseCacheMixin,
+    SparseFieldsMixin,
+)
+from .pagination import PubDateCursorPagination
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrReadOnly
+from .search import get_search_backend
 from .serializers import (
     CategorySerializer,
+    CommentsBulkSerializer,
     CommentsSerializer,
     GenreSerializer,
+    ReviewBulkSerializer,
     ReviewSerializer,
     SignUpSerializer,
+    TitleBulkSerializer,
     TitleSerializer,
     TokenSerializer,
     UserSerializer,
@@ -28,6 +64,9 @@ from .serializers import (
 
 
 class ListCreateDestroyViewSet(
+    ReplicaRoutingMixin,
+    ResponseCacheMixin,
+    SerializerTimingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -46,24 +85,41 @@ class ListCreateDestroyViewSet(
 class CategoryViewSet(ListCreateDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    version_tables = (TableVersion.CATEGORIES,)
 
 
 class GenreViewSet(ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    version_tables = (TableVersion.GENRES,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ReplicaRoutingMixin,
+    ResponseCacheMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     http_method_names = ['post', 'get', 'delete', 'patch']
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-        'name'
+    queryset = (
+        Title.objects.select_related('category')
+        .prefetch_related('genre')
+        .order_by('name')
     )
     serializer_class = TitleSerializer
+    fast_serializer_class = TitleFastSerializer
     permission_classes = [
         IsAdminOrReadOnly,
     ]
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilterSet
+    version_tables = (
+        TableVersion.TITLES,
+        TableVersion.CATEGORIES,
+        TableVersion.GENRES,
+    )
 
     def perform_create(self, serializer):
         category = get_object_or_404(
@@ -78,48 +134,167 @@ class TitleViewSet(viewsets.ModelViewSet):
         self.perform_create(serializer)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ReplicaRoutingMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     """Настройки вьюсета модели Review."""
 
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    fast_serializer_class = ReviewFastSerializer
     permission_classes = (IsAuthorOrReadOnly,)
+    pagination_class = PubDateCursorPagination
     ordering_fields = ('-pub_date',)
     http_method_names = ['post', 'get', 'delete', 'patch']
 
+    def get_title(self):
+        """Возвращает произведение из URL, запрашивая его один раз."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title.objects.only('id'), id=self.kwargs.get('title_id')
+            )
+        return self._title
+
     def get_queryset(self):
         """Определяет необходимый набор queryset для сериализации."""
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
         """Создание нового экземпляра модели после сериализации."""
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        title = self.get_title()
+        with transaction.atomic():
+            review = serializer.save(author=self.request.user, title=title)
+            Title.objects.filter(pk=title.pk).add_to_rating(review.score)
 
+    def perform_update(self, serializer):
+        """Обновление отзыва с учётом изменения оценки в рейтинге."""
+        old_score = serializer.instance.score
+        with transaction.atomic():
+            review = serializer.save()
+            if review.score != old_score:
+                Title.objects.filter(pk=review.title_id).add_to_rating(
+                    review.score - old_score, count=0
+                )
+
+    def perform_destroy(self, instance):
+        """Удаление отзыва и исключение его оценки из рейтинга."""
+        with transaction.atomic():
+            instance.delete()
+            Title.objects.filter(pk=instance.title_id).add_to_rating(
+                -instance.score, count=-1
+            )
 
-class CommentsViewSet(viewsets.ModelViewSet):
+
+class CommentsViewSet(
+    ReplicaRoutingMixin,
+    SparseFieldsMixin,
+    FastListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     """Настройки вьюсета модели Comments."""
 
     queryset = Comments.objects.all()
     serializer_class = CommentsSerializer
+    fast_serializer_class = CommentsFastSerializer
     permission_classes = (IsAuthorOrReadOnly,)
+    pagination_class = PubDateCursorPagination
     ordering_fields = ('-pub_date',)
     http_method_names = ['post', 'get', 'delete', 'patch']
 
+    def get_review(self):
+        """Возвращает отзыв из URL, запрашивая его один раз.
+
+        Отзыв ищется сразу по ``review_id`` и ``title_id``, поэтому
+        отзыв к другому произведению даёт 404.
+        """
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.only('id', 'title_id'),
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
+
     def get_queryset(self):
         """Определяет необходимый набор queryset для сериализации."""
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
         """Создание нового экземпляра модели после сериализации."""
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_review())
+
+
+class BulkCreateView(ReplicaRoutingMixin, APIView):
+    """Создание списка объектов одним запросом и одной транзакцией.
+
+    При ошибках возвращается 400 со списком ошибок по объектам в том же
+    порядке, что и в запросе; ничего не создаётся.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = None
+
+    def post(self, request):
+        serializer = self.serializer_class(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            context={'request': request, 'view': self},
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+            self.after_save(serializer)
+        return Response(
+            self.get_response_data(serializer),
+            status=status.HTTP_201_CREATED,
+        )
+
+    def after_save(self, serializer):
+        """Действия после записи внутри той же транзакции."""
+
+    def get_response_data(self, serializer):
+        return serializer.data
+
+
+class ReviewBulkCreateView(BulkCreateView):
+    serializer_class = ReviewBulkSerializer
+
+
+class CommentsBulkCreateView(BulkCreateView):
+    serializer_class = CommentsBulkSerializer
+
+
+class TitleBulkView(BulkCreateView):
+    """Массовое создание и изменение произведений администратором.
+
+    Сигналы моделей при массовой записи не отправляются, поэтому индексы
+    поиска и подсказок и версия таблицы обновляются здесь.
+    """
+
+    permission_classes = (IsAuthenticated, IsAdmin)
+    serializer_class = TitleBulkSerializer
+
+    def after_save(self, serializer):
+        titles = serializer.instance
+        get_search_backend().index(titles)
+        for title in titles:
+            autocomplete_index.update('titles', title)
+        TableVersion.objects.bump(TableVersion.TITLES)
+
+    def get_response_data(self, serializer):
+        ids = [title.pk for title in serializer.instance]
+        created = serializer.child.created_count
+        return {
+            'created': created,
+            'updated': len(ids) - created,
+            'ids': ids,
+        }
 
 
 class APISignup(APIView):
@@ -127,12 +302,11 @@ class APISignup(APIView):
 
     @staticmethod
     def send_email(data):
-        email = EmailMessage(
+        get_mail_queue().enqueue(
             subject=data['email_subject'],
             body=data['email_body'],
-            to=[data['to_email']],
+            to_email=data['to_email'],
         )
-        email.send()
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
@@ -175,7 +349,7 @@ class APIGetToken(APIView):
         )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     permission_classes = (IsAuthenticated, IsAdmin)
     lookup_field = 'username'
@@ -184,6 +358,18 @@ class UserViewSet(viewsets.ModelViewSet):
     http_method_names = ('get', 'post', 'patch', 'delete', 'head', 'options')
     serializer_class = UserSerializer
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        user_cache.invalidate(serializer.instance.pk)
+
+    def perform_destroy(self, instance):
+        title_ids = list(instance.reviews.values_list('title_id', flat=True))
+        user_id = instance.pk
+        with transaction.atomic():
+            instance.delete()
+            Title.objects.filter(pk__in=title_ids).recalculate_rating()
+        user_cache.invalidate(user_id)
+
     @action(
         methods=['GET', 'PATCH'],
         detail=False,
@@ -200,4 +386,83 @@ class UserViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save(role=request.user.role)
+        user_cache.invalidate(request.user.pk)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """Метрики запросов в текстовом формате Prometheus."""
+
+    permission_classes = (IsAuthenticated, IsAdmin)
+
+    def get(self, request):
+        return HttpResponse(
+            registry.render() + render_pools(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка произведений, отзывов или комментариев.
+
+    Адрес - ``export/<таблица>.<формат>``, где таблица - titles, reviews
+    или comments, а формат - csv или ndjson.
+    """
+
+    permission_classes = (IsAuthenticated, IsAdmin)
+
+    def get(self, request, table, extension):
+        if table not in EXPORTS or extension not in FORMATS:
+            raise Http404
+        chunks = export(table, extension)
+        filename = EXPORTS[table][1].replace('.csv', f'.{extension}')
+        if isinstance(request._request, ASGIRequest):
+            return FileResponse(
+                spool(chunks),
+                as_attachment=True,
+                filename=filename,
+                content_type=FORMATS[extension],
+            )
+        response = StreamingHttpResponse(
+            chunks, content_type=FORMATS[extension]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+
+class AutocompleteView(APIView):
+    """Подсказки по началу названия категорий, жанров и произведений.
+
+    Параметры: ``q`` - начало названия, ``type`` - categories, genres или
+    titles (можно несколько через запятую, по умолчанию все),
+    ``limit`` - число подсказок каждого типа.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        kinds = request.query_params.get('type', ','.join(KINDS)).split(',')
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            return Response(
+                {'type': f'Неизвестный тип: {", ".join(sorted(unknown))}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(
+                request.query_params.get('limit', settings.AUTOCOMPLETE_LIMIT)
+            )
+        except ValueError:
+            return Response(
+                {'limit': 'Должно быть целым числом.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = min(max(limit, 1), settings.AUTOCOMPLETE_MAX_LIMIT)
+        return Response({
+            kind: autocomplete_index.lookup(kind, query, limit) if query
+            else []
+            for kind in kinds
+        })
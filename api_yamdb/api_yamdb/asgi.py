@@ -12,5 +12,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+# Вьюхи под ASGI выполняются в разных потоках, поэтому вместо постоянных
+# соединений на поток используется общий пул соединений. Асинхронные вьюхи
+# каталога (YAMDB_ASYNC_VIEWS=1) включаются явно: в замерах
+# benchmark --asgi они не быстрее обычных.
+os.environ.setdefault('YAMDB_DB_POOL', '1')
 
 application = get_asgi_application()
+
+from api.autocomplete import autocomplete_index  # noqa: E402
+
+autocomplete_index.start()
@@ -0,0 +1,6 @@
+"""URLconf для ASGI: те же маршруты с асинхронными вьюхами каталога."""
+from api.async_views import async_patterns
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = async_patterns(sync_urlpatterns)
@@ -0,0 +1,10 @@
+"""SQLite с настройкой соединения под конкурентную нагрузку.
+
+Подключается как ``ENGINE: 'api_yamdb.backends.sqlite'``. Помимо
+обычных параметров ``sqlite3.connect`` в ``OPTIONS`` понимает:
+
+* ``pragmas`` - словарь PRAGMA, которые выполняются по порядку при
+  каждом новом соединении;
+* ``transaction_mode`` - режим ``BEGIN`` для ``transaction.atomic``:
+  ``DEFERRED``, ``IMMEDIATE`` или ``EXCLUSIVE``.
+"""
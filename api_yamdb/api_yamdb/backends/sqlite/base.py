@@ -0,0 +1,104 @@
+from functools import partial
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+from .pool import get_pool
+
+PRAGMA_VALUE = re.compile(r'^-?\d+$|^[A-Za-z_]+$')
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+def check_usable(conn):
+    try:
+        conn.execute('SELECT 1')
+    except base.Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Применяет PRAGMA и режим транзакций из ``OPTIONS``.
+
+    При ``CONN_HEALTH_CHECKS`` постоянное соединение проверяется перед
+    первым использованием в каждом запросе и переоткрывается, если оно
+    больше не работает. ``OPTIONS['pool']`` включает общий пул
+    соединений процесса: ``{'max_size': 8, 'timeout': 10}``.
+    """
+
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(settings_dict, *args, **kwargs)
+        self.health_check_done = False
+        options = self.settings_dict['OPTIONS']
+        self.pool = None
+        if options.get('pool') is not None:
+            self.pool = get_pool(self.alias, **options['pool'])
+        self.pragmas = dict(options.get('pragmas') or {})
+        for name, value in self.pragmas.items():
+            if not (name.isidentifier() and PRAGMA_VALUE.match(str(value))):
+                raise ImproperlyConfigured(
+                    f'Недопустимая PRAGMA в настройках базы: {name}={value}'
+                )
+        self.transaction_mode = options.get('transaction_mode')
+        if self.transaction_mode is not None:
+            self.transaction_mode = self.transaction_mode.upper()
+            if self.transaction_mode not in TRANSACTION_MODES:
+                raise ImproperlyConfigured(
+                    'transaction_mode должен быть одним из: '
+                    + ', '.join(TRANSACTION_MODES)
+                )
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop('pragmas', None)
+        kwargs.pop('transaction_mode', None)
+        kwargs.pop('pool', None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        if self.pool is not None:
+            return self.pool.acquire(
+                partial(self.create_connection, conn_params), check_usable
+            )
+        return self.create_connection(conn_params)
+
+    def create_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            super()._close()
+        else:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
+
+    def is_usable(self):
+        return check_usable(self.connection)
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if (self.connection is not None
+                and not self.health_check_done
+                and self.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not self.in_atomic_block):
+            if not self.is_usable():
+                self.close()
+            self.health_check_done = True
+        super().ensure_connection()
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,107 @@
+"""Пул соединений SQLite внутри процесса.
+
+При ASGI синхронный код запросов выполняется в разных потоках, и
+постоянные соединения Django, привязанные к потоку, копятся в каждом
+из них. Пул вместо этого держит общий набор соединений: Django
+«закрывает» соединение в конце запроса, а бэкенд возвращает его в пул.
+"""
+from threading import Condition, Lock
+from time import perf_counter
+
+from django.db.backends.sqlite3.base import Database
+
+pools = {}
+pools_lock = Lock()
+
+
+class ConnectionPool:
+    """Ограниченный набор соединений со статистикой ожидания."""
+
+    def __init__(self, max_size=8, timeout=10):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle = []
+        self.in_use = 0
+        self.waits = 0
+        self.wait_seconds = 0
+        self.timeouts = 0
+        self._condition = Condition()
+
+    def acquire(self, factory, check=None):
+        """Выдаёт свободное соединение, создаёт новое или ждёт.
+
+        Новые соединения создаёт ``factory``. Если ``check`` для
+        свободного соединения возвращает ``False``, оно закрывается и
+        вместо него создаётся новое.
+        """
+        started = None
+        with self._condition:
+            while not self.idle and self.in_use >= self.max_size:
+                if started is None:
+                    started = perf_counter()
+                    self.waits += 1
+                remaining = self.timeout - (perf_counter() - started)
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    self.wait_seconds += perf_counter() - started
+                    self.timeouts += 1
+                    raise Database.OperationalError(
+                        f'Нет свободных соединений в пуле за '
+                        f'{self.timeout} с.'
+                    )
+            if started is not None:
+                self.wait_seconds += perf_counter() - started
+            self.in_use += 1
+            conn = self.idle.pop() if self.idle else None
+        try:
+            if conn is not None and check is not None and not check(conn):
+                conn.close()
+                conn = None
+            return conn if conn is not None else factory()
+        except BaseException:
+            self.discard()
+            raise
+
+    def release(self, conn):
+        """Возвращает соединение в пул, откатив незавершённую транзакцию."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Database.Error:
+            conn.close()
+            self.discard()
+            return
+        with self._condition:
+            self.in_use -= 1
+            self.idle.append(conn)
+            self._condition.notify()
+
+    def discard(self):
+        """Освобождает место соединения, которое было закрыто."""
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify()
+
+    def close(self):
+        with self._condition:
+            for conn in self.idle:
+                conn.close()
+            self.idle.clear()
+
+    def stats(self):
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'in_use': self.in_use,
+                'idle': len(self.idle),
+                'waits': self.waits,
+                'wait_seconds': self.wait_seconds,
+                'timeouts': self.timeouts,
+            }
+
+
+def get_pool(alias, max_size=8, timeout=10):
+    """Возвращает пул базы ``alias``, создавая его при первом вызове."""
+    with pools_lock:
+        if alias not in pools:
+            pools[alias] = ConnectionPool(max_size, timeout)
+        return pools[alias]
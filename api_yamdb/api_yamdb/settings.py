@@ -1,5 +1,6 @@
 """Django settings for yamdb project."""
 from datetime import timedelta
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -38,7 +40,11 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'api_yamdb.urls'
+# YAMDB_ASYNC_VIEWS=1 включает под ASGI чтение каталога через асинхронные
+# вьюхи из api.async_views; по умолчанию выключено, WSGI не затрагивает.
+ASYNC_VIEWS = os.environ.get('YAMDB_ASYNC_VIEWS') == '1'
+ASYNC_VIEW_WORKERS = 8
+ROOT_URLCONF = 'api_yamdb.asgi_urls' if ASYNC_VIEWS else 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
@@ -62,14 +68,77 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+# PRAGMA выполняются по порядку при каждом новом соединении, поэтому
+# busy_timeout идёт первым: переключению в WAL тоже может понадобиться
+# подождать блокировку. Режим IMMEDIATE берёт блокировку на запись в
+# начале transaction.atomic, и транзакция, начавшаяся с чтения, не
+# получает «database is locked» при переходе к записи.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
+# Постоянные соединения живут DB_CONN_MAX_AGE секунд и проверяются
+# перед повторным использованием. YAMDB_DB_POOL=1 (его выставляет
+# asgi.py) включает общий пул соединений процесса: соединение
+# возвращается в пул в конце каждого запроса, поэтому CONN_MAX_AGE = 0.
+DB_POOL = os.environ.get('YAMDB_DB_POOL') == '1'
+# Пул рассчитан на рабочие потоки асинхронных вьюх и общий поток
+# синхронных.
+DB_POOL_OPTIONS = {
+    'max_size': ASYNC_VIEW_WORKERS + 1, 'timeout': 10
+} if DB_POOL else None
+DB_CONN_MAX_AGE = 0 if DB_POOL else 60
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.backends.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pragmas': SQLITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+            'pool': DB_POOL_OPTIONS,
+        },
+    },
+    # Реплика только для чтения. Локально это тот же файл; в бою NAME
+    # указывает на копию, которую поддерживает репликация (например,
+    # Litestream или LiteFS).
+    'replica': {
+        'ENGINE': 'api_yamdb.backends.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'pragmas': SQLITE_PRAGMAS, 'pool': DB_POOL_OPTIONS},
+    },
 }
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+DATABASE_REPLICAS = ('replica',)
+REPLICA_PIN_SECONDS = 10
+REPLICA_PIN_CACHE_ALIAS = 'default'
 
 
+# Кэш ответов списков каталога. Для нескольких процессов или серверов
+# замените бэкенд ``responses`` на общий, например Redis или Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_ENABLED = True
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -112,15 +181,49 @@ SIMPLE_JWT = {
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
 }
+AUTH_USER_CACHE_TTL = 30
+AUTH_USER_CACHE_SIZE = 1024
+
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageSizePagination',
     'PAGE_SIZE': 5,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
 AUTH_USER_MODEL = 'reviews.User'
 
+METRICS_ENABLED = True
+
+MAX_PAGE_SIZE = 1000
+
+FAST_SERIALIZERS_ENABLED = True
+JSON_STREAM_MIN_ITEMS = 500
+JSON_STREAM_CHUNK_SIZE = 100
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+BULK_MAX_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+TITLE_SEARCH_BACKEND = None
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_MAX_AGE = 300
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+MAIL_QUEUE_BACKEND = 'api.mail.DatabaseMailQueue'
+MAIL_QUEUE_BATCH_SIZE = 100
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_DELAY = 30
+MAIL_QUEUE_LEASE_SECONDS = 300
+MAIL_QUEUE_SENT_RETENTION = 24 * 60 * 60
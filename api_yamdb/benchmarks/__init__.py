@@ -0,0 +1,6 @@
+"""Нагрузочные замеры API.
+
+Синтетические данные создаются через модели проекта в отдельной
+тестовой базе, запросы выполняются в процессе через URLconf проекта.
+Запуск: ``python manage.py benchmark``.
+"""
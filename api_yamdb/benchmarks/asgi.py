@@ -0,0 +1,100 @@
+"""Пропускная способность чтения каталога под ASGI.
+
+Запросы подаются прямо в ASGI-приложение Django из нескольких
+конкурентных задач, как это делал бы ASGI-сервер: сначала с обычным
+URLconf, где синхронные вьюхи по очереди выполняются в общем потоке,
+затем с ``api_yamdb.asgi_urls``, где чтение каталога идёт в пуле
+рабочих потоков. Кэш ответов отключается, чтобы каждый запрос
+доходил до базы.
+"""
+import asyncio
+from time import perf_counter
+
+from django.core.handlers.asgi import ASGIHandler
+from django.test.utils import override_settings
+
+from .runner import percentile
+
+URLCONFS = (
+    ('sync', 'api_yamdb.urls'),
+    ('async', 'api_yamdb.asgi_urls'),
+)
+
+
+def get_urls(dataset):
+    title = f'/api/v1/titles/{dataset["titles"] // 2}/'
+    return (
+        '/api/v1/titles/',
+        title,
+        f'{title}reviews/',
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+    )
+
+
+async def call(application, path):
+    """Выполняет GET-запрос к ASGI-приложению и возвращает статус."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def drive(application, urls, concurrency, requests):
+    counter = iter(range(requests))
+    timings = []
+    statuses = set()
+
+    async def client():
+        for idx in counter:
+            started = perf_counter()
+            statuses.add(await call(application, urls[idx % len(urls)]))
+            timings.append(perf_counter() - started)
+
+    started = perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return perf_counter() - started, timings, statuses
+
+
+def run(dataset, concurrency=32, requests=2000):
+    """Возвращает ``{URLconf: сводка}`` для обычных и асинхронных вьюх."""
+    urls = get_urls(dataset)
+    results = {}
+    for name, urlconf in URLCONFS:
+        with override_settings(
+            ROOT_URLCONF=urlconf, RESPONSE_CACHE_ENABLED=False
+        ):
+            application = ASGIHandler()
+            asyncio.run(drive(application, urls, concurrency, len(urls)))
+            elapsed, timings, statuses = asyncio.run(
+                drive(application, urls, concurrency, requests)
+            )
+        results[name] = {
+            'requests_per_s': round(requests / elapsed, 1),
+            'p50_ms': round(percentile(timings, 50) * 1000, 2),
+            'p99_ms': round(percentile(timings, 99) * 1000, 2),
+            'statuses': sorted(statuses),
+        }
+    return results
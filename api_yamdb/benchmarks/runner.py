@@ -0,0 +1,127 @@
+from contextlib import ExitStack
+from time import perf_counter
+import tracemalloc
+
+from django.db import connections, transaction
+from django.test import Client
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+from .scenarios import ADMIN, ANONYMOUS, USER, WRITER, get_scenarios
+
+
+def percentile(values, percent):
+    """Процентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(-(-len(ordered) * percent // 100), 1)
+    return ordered[int(rank) - 1]
+
+
+def get_clients(dataset):
+    clients = {ANONYMOUS: Client()}
+    for role, pk in ((ADMIN, 1), (USER, 2), (WRITER, dataset['users'])):
+        token = AccessToken.for_user(User.objects.get(pk=pk))
+        clients[role] = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return clients
+
+
+def send(client, method, url, data):
+    """Выполняет запрос; запросы на запись откатываются.
+
+    Словари отправляются формой, как в тестах, списки - JSON.
+    Потоковый ответ читается целиком, чтобы его запросы попали в замер.
+    """
+    if method == 'get':
+        response = client.get(url, data)
+    else:
+        content_type = MULTIPART_CONTENT
+        if isinstance(data, list):
+            content_type = 'application/json'
+        elif method != 'post':
+            data = encode_multipart(BOUNDARY, data or {})
+        with transaction.atomic():
+            response = getattr(client, method)(
+                url, data, content_type=content_type
+            )
+            transaction.set_rollback(True)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def run_scenario(client, method, build, iterations, warmup):
+    """Выполняет сценарий и возвращает сводку по времени и запросам.
+
+    Аллокации считаются отдельным проходом, чтобы tracemalloc не
+    искажал замеры времени.
+    """
+    for iteration in range(warmup):
+        url, data = build(iteration)
+        send(client, method, url, data)
+    timings = []
+    queries = []
+    statuses = set()
+    for iteration in range(warmup, warmup + iterations):
+        url, data = build(iteration)
+        with ExitStack() as stack:
+            captured = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in connections
+            ]
+            started = perf_counter()
+            response = send(client, method, url, data)
+            timings.append(perf_counter() - started)
+        queries.append(sum(map(len, captured)))
+        statuses.add(response.status_code)
+    allocations = []
+    tracemalloc.start()
+    try:
+        for iteration in range(warmup + iterations,
+                               warmup + iterations * 2):
+            url, data = build(iteration)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            send(client, method, url, data)
+            allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        'iterations': iterations,
+        'statuses': sorted(statuses),
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'queries_per_request': sum(queries) / len(queries),
+        'peak_alloc_kib': percentile(allocations, 50) / 1024,
+    }
+
+
+def run(dataset, iterations=100, warmup=10, only=None):
+    clients = get_clients(dataset)
+    results = {}
+    for name, method, role, build in get_scenarios(dataset):
+        if only and name not in only:
+            continue
+        results[name] = run_scenario(
+            clients[role], method, build, iterations, warmup
+        )
+    return results
+
+
+def compare(previous, current):
+    """Относительное изменение p50/p95/p99 и числа запросов."""
+    changes = {}
+    for name, result in current.items():
+        before = previous.get(name)
+        if before is None:
+            continue
+        changes[name] = {
+            key: (result[key] - before[key]) / before[key] * 100
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+            if before.get(key)
+        }
+    return changes
@@ -0,0 +1,217 @@
+"""Сценарии запросов ко всем эндпоинтам ``api/urls.py``.
+
+Каждый сценарий - имя маршрута, HTTP-метод, роль клиента и функция,
+которая по номеру итерации возвращает URL и тело запроса. Сценарии
+записи идут последними, и раннер откатывает каждый такой запрос, так
+что все итерации работают с одними и теми же данными.
+"""
+from django.contrib.auth.tokens import default_token_generator
+
+from reviews.models import User
+
+ANONYMOUS = 'anonymous'
+USER = 'user'
+ADMIN = 'admin'
+# Последний пользователь набора данных, у которого нет отзывов.
+WRITER = 'writer'
+
+BULK_SIZE = 20
+
+
+def signup(iteration):
+    return '/api/v1/auth/signup/', {
+        'username': f'signup{iteration}',
+        'email': f'signup{iteration}@yamdb.fake',
+    }
+
+
+def get_token(iteration):
+    user = User.objects.get(pk=2)
+    return '/api/v1/auth/token/', {
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    }
+
+
+def static(url, data=None):
+    return lambda iteration: (url, data)
+
+
+def by_title(template, dataset, data=None):
+    def build(iteration):
+        title_id = iteration % dataset['titles'] + 1
+        return template.format(title_id=title_id), data
+    return build
+
+
+def by_review(template, dataset, data=None):
+    def build(iteration):
+        review_id = iteration % dataset['reviews'] + 1
+        title_id = (review_id - 1) % dataset['titles'] + 1
+        return template.format(title_id=title_id, review_id=review_id), data
+    return build
+
+
+def by_comment(template, dataset, data=None):
+    def build(iteration):
+        comment_id = iteration % dataset['comments'] + 1
+        review_id = (comment_id - 1) % dataset['reviews'] + 1
+        title_id = (review_id - 1) % dataset['titles'] + 1
+        return template.format(
+            title_id=title_id, review_id=review_id, comment_id=comment_id
+        ), data
+    return build
+
+
+def create_named(url):
+    def build(iteration):
+        return url, {'name': f'Новая {iteration}', 'slug': f'new-{iteration}'}
+    return build
+
+
+def create_title(iteration):
+    return '/api/v1/titles/', {
+        'name': f'Новое произведение {iteration}',
+        'year': 2000,
+        'category': 'category-1',
+        'genre': ['genre-1', 'genre-2'],
+    }
+
+
+def bulk_titles(iteration):
+    return '/api/v1/titles/bulk/', [
+        {
+            'name': f'Пачка {iteration}-{idx}',
+            'year': 2000,
+            'category': 'category-1',
+            'genre': ['genre-1'],
+        }
+        for idx in range(BULK_SIZE)
+    ]
+
+
+def create_user(iteration):
+    return '/api/v1/users/', {
+        'username': f'created{iteration}',
+        'email': f'created{iteration}@yamdb.fake',
+    }
+
+
+def bulk_reviews(dataset):
+    def build(iteration):
+        return '/api/v1/reviews/bulk/', [
+            {
+                'title': (iteration + idx) % dataset['titles'] + 1,
+                'text': f'Отзыв из пачки {idx}',
+                'score': idx % 10 + 1,
+            }
+            for idx in range(min(BULK_SIZE, dataset['titles']))
+        ]
+    return build
+
+
+def bulk_comments(dataset):
+    def build(iteration):
+        return '/api/v1/comments/bulk/', [
+            {
+                'review': (iteration + idx) % dataset['reviews'] + 1,
+                'text': f'Комментарий из пачки {idx}',
+            }
+            for idx in range(BULK_SIZE)
+        ]
+    return build
+
+
+def get_write_scenarios(dataset):
+    reviews = '/api/v1/titles/{title_id}/reviews/'
+    comments = reviews + '{review_id}/comments/'
+    title = '/api/v1/titles/{title_id}/'
+    scenarios = [
+        ('category-create', 'post', ADMIN,
+         create_named('/api/v1/categories/')),
+        ('category-delete', 'delete', ADMIN,
+         static('/api/v1/categories/category-1/')),
+        ('genre-create', 'post', ADMIN, create_named('/api/v1/genres/')),
+        ('genre-delete', 'delete', ADMIN,
+         static('/api/v1/genres/genre-1/')),
+        ('title-create', 'post', ADMIN, create_title),
+        ('title-update', 'patch', ADMIN, by_title(title, dataset, {
+            'name': 'Новое название',
+            'category': 'category-2',
+            'genre': ['genre-3'],
+        })),
+        ('title-delete', 'delete', ADMIN, by_title(title, dataset)),
+        ('title-bulk', 'post', ADMIN, bulk_titles),
+        ('users-create', 'post', ADMIN, create_user),
+        ('users-update', 'patch', ADMIN,
+         static('/api/v1/users/user2/', {'bio': 'Новая биография'})),
+        ('users-delete', 'delete', ADMIN, static('/api/v1/users/user2/')),
+        ('users-me-update', 'patch', USER,
+         static('/api/v1/users/me/', {'bio': 'Новая биография'})),
+        ('review-create', 'post', WRITER,
+         by_title(reviews, dataset, {'text': 'Новый отзыв', 'score': 5})),
+        ('review-bulk', 'post', WRITER, bulk_reviews(dataset)),
+    ]
+    if dataset['reviews']:
+        scenarios += [
+            ('review-update', 'patch', ADMIN,
+             by_review(reviews + '{review_id}/', dataset, {'score': 7})),
+            ('review-delete', 'delete', ADMIN,
+             by_review(reviews + '{review_id}/', dataset)),
+            ('comment-create', 'post', USER,
+             by_review(comments, dataset, {'text': 'Новый комментарий'})),
+            ('comment-bulk', 'post', USER, bulk_comments(dataset)),
+        ]
+    if dataset['comments']:
+        scenarios += [
+            ('comment-update', 'patch', ADMIN, by_comment(
+                comments + '{comment_id}/', dataset, {'text': 'Изменён'}
+            )),
+            ('comment-delete', 'delete', ADMIN,
+             by_comment(comments + '{comment_id}/', dataset)),
+        ]
+    return scenarios
+
+
+def get_scenarios(dataset):
+    reviews = '/api/v1/titles/{title_id}/reviews/'
+    comments = reviews + '{review_id}/comments/'
+    scenarios = [
+        ('signup', 'post', ANONYMOUS, signup),
+        ('get_token', 'post', ANONYMOUS, get_token),
+        ('title-list', 'get', ANONYMOUS, static('/api/v1/titles/')),
+        ('title-list-filtered', 'get', ANONYMOUS,
+         static('/api/v1/titles/?genre=genre-1&year=1950')),
+        ('title-list-search', 'get', ANONYMOUS,
+         lambda iteration: ('/api/v1/titles/', {'search': 'описание 1'})),
+        ('title-detail', 'get', ANONYMOUS,
+         by_title('/api/v1/titles/{title_id}/', dataset)),
+        ('category-list', 'get', ANONYMOUS, static('/api/v1/categories/')),
+        ('genre-list', 'get', ANONYMOUS, static('/api/v1/genres/')),
+        ('users-list', 'get', ADMIN, static('/api/v1/users/')),
+        ('users-detail', 'get', ADMIN, static('/api/v1/users/user2/')),
+        ('users-me', 'get', USER, static('/api/v1/users/me/')),
+        ('metrics', 'get', ADMIN, static('/api/v1/metrics/')),
+        ('export-titles', 'get', ADMIN,
+         static('/api/v1/export/titles.csv')),
+        ('export-reviews', 'get', ADMIN,
+         static('/api/v1/export/reviews.ndjson')),
+        ('autocomplete', 'get', ANONYMOUS,
+         lambda iteration: ('/api/v1/autocomplete/', {'q': 'произв'})),
+    ]
+    if dataset['reviews']:
+        scenarios += [
+            ('review-list', 'get', ANONYMOUS, by_title(reviews, dataset)),
+            ('review-list-cursor', 'get', ANONYMOUS,
+             by_title(reviews + '?cursor=', dataset)),
+            ('review-detail', 'get', ANONYMOUS,
+             by_review(reviews + '{review_id}/', dataset)),
+        ]
+    if dataset['comments']:
+        scenarios += [
+            ('comment-list', 'get', ANONYMOUS,
+             by_review(comments, dataset)),
+            ('comment-detail', 'get', ANONYMOUS,
+             by_comment(comments + '{comment_id}/', dataset)),
+        ]
+    return scenarios + get_write_scenarios(dataset)
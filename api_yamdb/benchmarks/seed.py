@@ -0,0 +1,100 @@
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from api.search import get_search_backend
+from reviews.models import (
+    Category, Comments, Genre, Review, TableVersion, Title, TitleGenres
+)
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+
+
+def insert(model, objects):
+    """Создаёт объекты пачками, не держа их все в памяти."""
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, BATCH_SIZE))
+        if not batch:
+            return
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+
+
+def seed(categories=10, genres=20, titles=1000, users=100, reviews=10000,
+         comments=10000):
+    """Заполняет базу синтетическими данными заданного размера.
+
+    Отзывы распределяются по произведениям по кругу, поэтому при
+    необходимости число пользователей увеличивается так, чтобы пара
+    автор-произведение оставалась уникальной, а у последнего
+    пользователя не было отзывов. Возвращает фактические размеры набора
+    данных.
+    """
+    users = max(users, -(-reviews // titles) + 1)
+    insert(Category, (
+        Category(id=idx, name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(1, categories + 1)
+    ))
+    insert(Genre, (
+        Genre(id=idx, name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(1, genres + 1)
+    ))
+    insert(Title, (
+        Title(
+            id=idx,
+            name=f'Произведение {idx}',
+            year=1900 + idx % 120,
+            description=f'Описание произведения {idx}',
+            category_id=idx % categories + 1,
+        )
+        for idx in range(1, titles + 1)
+    ))
+    insert(TitleGenres, (
+        TitleGenres(title_id=idx, genre_id=(idx + shift) % genres + 1)
+        for idx in range(1, titles + 1)
+        for shift in range(min(2, genres))
+    ))
+    insert(User, (
+        User(
+            id=idx,
+            username=f'user{idx}',
+            email=f'user{idx}@yamdb.fake',
+            role=User.ADMIN if idx == 1 else User.USER,
+        )
+        for idx in range(1, users + 1)
+    ))
+    insert(Review, (
+        Review(
+            id=idx + 1,
+            title_id=idx % titles + 1,
+            author_id=idx // titles + 1,
+            text=f'Отзыв {idx}',
+            score=idx % 10 + 1,
+        )
+        for idx in range(reviews)
+    ))
+    insert(Comments, (
+        Comments(
+            review_id=idx % reviews + 1,
+            author_id=idx % users + 1,
+            text=f'Комментарий {idx}',
+        )
+        for idx in range(comments)
+    ) if reviews else ())
+    Title.objects.recalculate_rating()
+    TableVersion.objects.bump(
+        TableVersion.CATEGORIES, TableVersion.GENRES, TableVersion.TITLES
+    )
+    get_search_backend().rebuild()
+    return {
+        'categories': categories,
+        'genres': genres,
+        'titles': titles,
+        'users': users,
+        'reviews': reviews,
+        'comments': comments if reviews else 0,
+    }
@@ -0,0 +1,88 @@
+"""Сравнение обычных и быстрых сериализаторов списков.
+
+Для каждого размера страницы замеряется время выборки и сериализации
+одной страницы в расчёте на объект, а также проверяется, что JSON
+обоих вариантов совпадает.
+"""
+from time import perf_counter
+
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import (
+    CommentsFastSerializer,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
+from api.serializers import (
+    CommentsSerializer,
+    ReviewSerializer,
+    TitleSerializer,
+)
+from reviews.models import Comments, Review, Title
+
+PAGE_SIZES = (5, 100, 1000)
+
+
+def get_cases():
+    return (
+        (
+            'titles',
+            Title.objects.select_related('category')
+            .prefetch_related('genre').order_by('name'),
+            TitleSerializer,
+            TitleFastSerializer,
+        ),
+        (
+            'reviews',
+            Review.objects.select_related('author').order_by('pub_date'),
+            ReviewSerializer,
+            ReviewFastSerializer,
+        ),
+        (
+            'comments',
+            Comments.objects.select_related('author').order_by('pub_date'),
+            CommentsSerializer,
+            CommentsFastSerializer,
+        ),
+    )
+
+
+def best_time(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = perf_counter()
+        function()
+        timings.append(perf_counter() - started)
+    return min(timings)
+
+
+def run(page_sizes=PAGE_SIZES, repeats=20):
+    """Возвращает ``{случай: {размер: сводка}}``, время в микросекундах."""
+    renderer = JSONRenderer()
+    results = {}
+    for name, queryset, serializer_class, fast_class in get_cases():
+        results[name] = {}
+        for page_size in page_sizes:
+            page = queryset[:page_size]
+            fast = fast_class()
+
+            def regular_page():
+                return serializer_class(list(page.all()), many=True).data
+
+            def fast_page():
+                return fast.serialize(list(fast.get_rows(page)))
+
+            items = len(page) or 1
+            regular_us = best_time(regular_page, repeats) / items * 1e6
+            fast_us = best_time(fast_page, repeats) / items * 1e6
+            results[name][page_size] = {
+                'items': len(page),
+                'regular_us_per_item': round(regular_us, 2),
+                'fast_us_per_item': round(fast_us, 2),
+                'speedup': round(regular_us / fast_us, 2),
+                'identical': (
+                    renderer.render(regular_page())
+                    == renderer.render(fast_page())
+                ),
+            }
+    return results
@@ -0,0 +1,150 @@
+"""Смешанная нагрузка чтения и записи на файловую базу SQLite.
+
+Для каждого варианта настроек создаётся отдельный файл базы с
+миграциями проекта, после чего несколько потоков в течение заданного
+времени читают страницы отзывов и создают новые отзывы с обновлением
+рейтинга, как это делает API. Вариант ``default`` - стандартный бэкенд
+Django без PRAGMA, ``tuned`` - настройки из ``settings.DATABASES``.
+"""
+from pathlib import Path
+from random import Random
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from threading import Barrier, Lock, Thread
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError, connections, transaction
+
+from reviews.models import Category, Review, Title
+
+User = get_user_model()
+
+
+def get_variants():
+    tuned = settings.DATABASES['default']
+    return {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'OPTIONS': {}},
+        'tuned': {
+            'ENGINE': tuned['ENGINE'],
+            'OPTIONS': dict(tuned.get('OPTIONS', {})),
+        },
+    }
+
+
+def prepare(alias, titles, users):
+    call_command('migrate', database=alias, verbosity=0)
+    Category.objects.using(alias).bulk_create(
+        [Category(id=1, name='Категория', slug='category')]
+    )
+    Title.objects.using(alias).bulk_create(
+        Title(id=idx, name=f'Произведение {idx}', year=2000, category_id=1)
+        for idx in range(1, titles + 1)
+    )
+    User.objects.using(alias).bulk_create(
+        User(id=idx, username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(1, users + 1)
+    )
+
+
+def worker(alias, titles, write_ratio, seed, pairs, barrier, duration,
+           stats, lock):
+    random = Random(seed)
+    reads, writes, errors, timings = 0, 0, 0, []
+    barrier.wait()
+    deadline = perf_counter() + duration
+    try:
+        while perf_counter() < deadline:
+            started = perf_counter()
+            try:
+                if random.random() < write_ratio:
+                    pair = next(pairs)
+                    title_id = pair % titles + 1
+                    score = random.randint(1, 10)
+                    with transaction.atomic(using=alias):
+                        Review.objects.using(alias).create(
+                            title_id=title_id,
+                            author_id=pair // titles + 1,
+                            text='Отзыв',
+                            score=score,
+                        )
+                        Title.objects.using(alias).filter(
+                            pk=title_id
+                        ).add_to_rating(score)
+                    writes += 1
+                else:
+                    list(
+                        Review.objects.using(alias)
+                        .filter(title_id=random.randint(1, titles))
+                        .select_related('author')
+                        .order_by('-pub_date')[:5]
+                    )
+                    list(
+                        Title.objects.using(alias)
+                        .select_related('category')
+                        .order_by('-rating')[:5]
+                    )
+                    reads += 1
+            except DatabaseError:
+                errors += 1
+            timings.append(perf_counter() - started)
+    finally:
+        connections[alias].close()
+    with lock:
+        stats['reads'] += reads
+        stats['writes'] += writes
+        stats['errors'] += errors
+        stats['timings'].extend(timings)
+
+
+def measure(alias, threads, duration, write_ratio, titles, users):
+    stats = {'reads': 0, 'writes': 0, 'errors': 0, 'timings': []}
+    barrier = Barrier(threads)
+    pairs = iter(range(titles * users))
+    lock = Lock()
+    workers = [
+        Thread(
+            target=worker,
+            args=(alias, titles, write_ratio, seed, pairs, barrier,
+                  duration, stats, lock),
+        )
+        for seed in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    percentiles = quantiles(stats['timings'] or [0.0, 0.0], n=100)
+    operations = stats['reads'] + stats['writes']
+    return {
+        'reads_per_s': round(stats['reads'] / duration, 1),
+        'writes_per_s': round(stats['writes'] / duration, 1),
+        'ops_per_s': round(operations / duration, 1),
+        'errors': stats['errors'],
+        'p50_ms': round(percentiles[49] * 1000, 2),
+        'p99_ms': round(percentiles[98] * 1000, 2),
+    }
+
+
+def run(threads=8, duration=5.0, write_ratio=0.2, titles=200, users=500):
+    """Возвращает ``{вариант: сводка}`` для настроек без PRAGMA и с ними."""
+    results = {}
+    for name, variant in get_variants().items():
+        alias = f'benchmark_{name}'
+        with TemporaryDirectory() as directory:
+            connections.databases[alias] = {
+                **variant, 'NAME': str(Path(directory) / 'db.sqlite3')
+            }
+            try:
+                prepare(alias, titles, users)
+                connections[alias].close()
+                results[name] = measure(
+                    alias, threads, duration, write_ratio, titles, users
+                )
+            finally:
+                connections[alias].close()
+                del connections[alias]
+                del connections.databases[alias]
+    return results
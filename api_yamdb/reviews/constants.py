@@ -13,3 +13,6 @@ USERNAME_LENGTH = 150
 EMAIL_LENGTH = 254
 ROLE_LENGTH = 254
 CODE_LENGTH = 254
+STATUS_LENGTH = 16
+CLAIM_OWNER_LENGTH = 32
+TABLE_NAME_LENGTH = 32
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+        'name, description, tokenize="unicode61 remove_diacritics 2")'
+    )
+    schema_editor.execute(
+        f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+        "SELECT id, name, COALESCE(description, '') FROM reviews_title"
+    )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_queuedemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
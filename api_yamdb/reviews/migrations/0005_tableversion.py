@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 17:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('table', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Таблица')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Версия')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'версия таблицы',
+                'verbose_name_plural': 'Версии таблиц',
+                'ordering': ('table',),
+            },
+        ),
+    ]
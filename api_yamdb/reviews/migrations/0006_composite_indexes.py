@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_tableversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', 'pub_date'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year', 'name'], name='title_category_year_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlegenres',
+            index=models.Index(fields=['genre', 'title'], name='title_genre_genre_title_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-18 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Обработчик'),
+        ),
+        migrations.AlterField(
+            model_name='queuedemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'pending'), ('sending', 'sending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', max_length=16, verbose_name='Статус'),
+        ),
+    ]
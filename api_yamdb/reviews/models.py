@@ -4,20 +4,37 @@ from django.core.validators import (
     MinValueValidator,
 )
 from django.db import models
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 
 from .constants import (
     CHAR_FIELD_LIMIT,
+    CLAIM_OWNER_LENGTH,
     CODE_LENGTH,
     EMAIL_LENGTH,
     MAX_TITLE_SCORE,
     MIN_TITLE_SCORE,
     ROLE_LENGTH,
     SLUG_FIELD_LIMIT,
+    STATUS_LENGTH,
     SYMBOLS_LIMIT,
+    TABLE_NAME_LENGTH,
     USERNAME_LENGTH,
 )
-from .validators import validate_username
+from .validators import validate_username, validate_year
 
 
 class User(AbstractUser):
@@ -115,6 +132,84 @@ class Category(models.Model):
         return self.name
 
 
+def get_rating_changes(score, count):
+    """Поля UPDATE, добавляющие ``score`` и ``count`` к рейтингу."""
+    new_sum = F('rating_sum') + score
+    new_count = F('rating_count') + count
+    return {
+        'rating_sum': new_sum,
+        'rating_count': new_count,
+        'rating': Case(
+            When(
+                rating_count__gt=-count,
+                then=Cast(new_sum, FloatField()) / new_count,
+            ),
+            default=Value(None),
+            output_field=FloatField(),
+        ),
+    }
+
+
+class TitleQuerySet(models.QuerySet):
+    """Набор запросов произведений с поддержкой хранимого рейтинга."""
+
+    def add_to_rating(self, score, count=1):
+        """Атомарно добавляет оценки к хранимому рейтингу.
+
+        Отрицательные значения ``score`` и ``count`` вычитают оценку,
+        например при удалении отзыва.
+        """
+        TableVersion.objects.db_manager(self.db).bump(TableVersion.TITLES)
+        return self.update(**get_rating_changes(score, count))
+
+    def add_to_ratings(self, ratings):
+        """Добавляет оценки к рейтингам нескольких произведений.
+
+        ``ratings`` - словарь ``{id произведения: (сумма, число оценок)}``.
+        Все рейтинги меняются одним UPDATE, версия таблицы - один раз.
+        """
+        if not ratings:
+            return 0
+
+        def per_title(index):
+            return Case(
+                *[
+                    When(pk=pk, then=Value(values[index]))
+                    for pk, values in ratings.items()
+                ],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+
+        TableVersion.objects.db_manager(self.db).bump(TableVersion.TITLES)
+        return self.filter(pk__in=ratings).update(
+            **get_rating_changes(per_title(0), per_title(1))
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает хранимый рейтинг по таблице отзывов."""
+        reviews = (
+            Review.objects.filter(title=OuterRef('pk'))
+            .order_by()
+            .values('title')
+        )
+        TableVersion.objects.db_manager(self.db).bump(TableVersion.TITLES)
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(average=Avg('score')).values('average'),
+                output_field=FloatField(),
+            ),
+        )
+
+
 class Title(models.Model):
     """Модель, описывающая произведение."""
 
@@ -123,7 +218,7 @@ class Title(models.Model):
     )
     year = models.PositiveSmallIntegerField(
         verbose_name='Год создания',
-        validators=[MaxValueValidator(timezone.now().year)],
+        validators=(validate_year,),
         db_index=True,
     )
     description = models.TextField(
@@ -143,11 +238,28 @@ class Title(models.Model):
         related_name='categories',
         verbose_name='Категория',
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True, blank=True, editable=False, verbose_name='Рейтинг'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=('category', 'year', 'name'),
+                name='title_category_year_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.name}, {self.year}, {self.description[:SYMBOLS_LIMIT]}'
@@ -159,6 +271,13 @@ class TitleGenres(models.Model):
         Genre, null=True, blank=True, on_delete=models.SET_NULL
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('genre', 'title'), name='title_genre_genre_title_idx'
+            ),
+        ]
+
 
 class Review(models.Model):
     """Настройки модели Отзывов."""
@@ -192,6 +311,11 @@ class Review(models.Model):
                 fields=['author', 'title'], name='unique_author_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date'), name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         """Возвращает строковое представление объекта."""
@@ -215,7 +339,148 @@ class Comments(models.Model):
         ordering = ('pub_date',)
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date'),
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         """Возвращает строковое представление объекта."""
         return self.text
+
+
+class QueuedEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, PENDING),
+        (SENDING, SENDING),
+        (SENT, SENT),
+        (FAILED, FAILED),
+    ]
+    subject = models.CharField(
+        max_length=CHAR_FIELD_LIMIT, verbose_name='Тема'
+    )
+    body = models.TextField(verbose_name='Текст')
+    to_email = models.EmailField(
+        max_length=EMAIL_LENGTH, verbose_name='Получатель'
+    )
+    status = models.CharField(
+        max_length=STATUS_LENGTH,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток отправки'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Следующая попытка'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    claimed_by = models.CharField(
+        max_length=CLAIM_OWNER_LENGTH,
+        blank=True,
+        verbose_name='Обработчик',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Дата добавления'
+    )
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Дата отправки'
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='queued_email_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.to_email}: {self.subject}'
+
+
+class TableVersionQuerySet(models.QuerySet):
+    """Счётчики версий таблиц каталога."""
+
+    def bump(self, *tables):
+        """Увеличивает версии таблиц; вызывается при каждой записи в них."""
+        now = timezone.now()
+        updated = self.filter(table__in=tables).update(
+            version=F('version') + 1, updated_at=now
+        )
+        if updated < len(tables):
+            self.bulk_create(
+                [
+                    TableVersion(table=table, version=1, updated_at=now)
+                    for table in tables
+                ],
+                ignore_conflicts=True,
+            )
+
+    def get_versions(self, *tables):
+        """Возвращает словарь ``{таблица: (версия, время изменения)}``.
+
+        Отсутствующие строки создаются с нулевой версией и сразу попадают
+        в ответ без повторного чтения.
+        """
+        versions = {
+            table: (version, updated_at)
+            for table, version, updated_at in self.filter(
+                table__in=tables
+            ).values_list('table', 'version', 'updated_at')
+        }
+        missing = set(tables) - set(versions)
+        if missing:
+            now = timezone.now()
+            self.bulk_create(
+                [
+                    TableVersion(table=table, updated_at=now)
+                    for table in missing
+                ],
+                ignore_conflicts=True,
+            )
+            versions.update({table: (0, now) for table in missing})
+        return versions
+
+
+class TableVersion(models.Model):
+    """Версия таблицы каталога для условных запросов и кэширования."""
+
+    CATEGORIES = 'categories'
+    GENRES = 'genres'
+    TITLES = 'titles'
+
+    table = models.CharField(
+        max_length=TABLE_NAME_LENGTH,
+        primary_key=True,
+        verbose_name='Таблица',
+    )
+    version = models.PositiveBigIntegerField(
+        default=0, verbose_name='Версия'
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Дата изменения'
+    )
+
+    objects = TableVersionQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('table',)
+        verbose_name = 'версия таблицы'
+        verbose_name_plural = 'Версии таблиц'
+
+    def __str__(self):
+        return f'{self.table}: {self.version}'
@@ -1,6 +1,7 @@
 import re
 
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 def validate_username(value):
@@ -14,3 +15,13 @@ def validate_username(value):
             (f'Недопустимые символы <{value}> в username.'),
             params={'value': value},
         )
+
+
+def validate_year(value):
+    """Год не больше текущего; текущий год вычисляется при проверке."""
+    year = timezone.now().year
+    if value > year:
+        raise ValidationError(
+            (f'Год не может быть больше текущего ({year}).'),
+            params={'value': value},
+        )
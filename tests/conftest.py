@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,34 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def sync_mail_queue(settings):
+    """Письма в тестах отправляются сразу, без фоновой очереди."""
+    settings.MAIL_QUEUE_BACKEND = 'api.mail.SyncMailQueue'
+
+
+@pytest.fixture(autouse=True)
+def primary_database_only(settings):
+    """Чтение с реплики включают только тесты, объявившие её базу."""
+    settings.DATABASE_REPLICAS = ()
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Кэши в памяти процесса не переносятся между тестами."""
+    from django.core.cache import caches
+
+    from api.authentication import user_cache
+    from api.autocomplete import autocomplete_index
+
+    user_cache.clear()
+    autocomplete_index.clear()
+    caches['default'].clear()
+    caches['responses'].clear()
+    yield
+    user_cache.clear()
+    autocomplete_index.clear()
+    caches['default'].clear()
+    caches['responses'].clear()
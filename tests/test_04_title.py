@@ -353,3 +353,32 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_titles_future_year(self, admin_client):
+        from django.utils import timezone
+
+        categories = create_categories(admin_client)
+        year = timezone.now().year
+        data = {
+            'name': 'Будущее', 'year': year + 1,
+            'category': categories[0]['slug'],
+        }
+        message = f'Год не может быть больше текущего ({year}).'
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['year'] == [message], (
+            'Проверьте, что ошибка года из будущего называет текущий год.'
+        )
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', [data], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == [{'year': [message]}], (
+            'Проверьте, что массовое создание возвращает то же сообщение '
+            'об ошибке года.'
+        )
+        data['year'] = year
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что произведение текущего года можно создать.'
+        )
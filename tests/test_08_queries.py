@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08Queries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    # Версии таблиц, COUNT, произведения с категориями и жанры.
+    TITLES_MAX_QUERIES = 4
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_titles_list_queries(self, admin_client, client,
+                                    django_assert_max_num_queries):
+        create_titles(admin_client)
+        with django_assert_max_num_queries(self.TITLES_MAX_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 2
+
+        for idx in range(3):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': ['horror', 'comedy'],
+                'category': 'films',
+            })
+        with django_assert_max_num_queries(self.TITLES_MAX_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 5, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от количества произведений на '
+            'странице.'
+        )
+
+    def test_02_title_detail_queries(self, admin_client, client,
+                                     django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with django_assert_max_num_queries(self.TITLES_MAX_QUERIES - 1):
+            response = client.get(url)
+        assert len(response.json()['genre']) == 2
+
+    def test_03_reviews_queries(self, admin_client, client, user_client,
+                                user, django_assert_num_queries):
+        _, _, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        # Пользователь уже в кэше аутентификации: проверка дубликата,
+        # произведение, BEGIN, INSERT, обновление рейтинга и версии
+        # таблицы произведений.
+        with django_assert_num_queries(6):
+            response = user_client.post(url, data={'text': 'Да', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_04_comments_queries(self, admin_client, client, user_client,
+                                 user, django_assert_num_queries):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(2):
+            response = user_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        response = user_client.post(url, data={'text': 'Не туда'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий нельзя оставить к отзыву, который '
+            'относится к другому произведению.'
+        )
+
+    def test_05_cascade_fast_delete(self, admin_client, user_client, user):
+        from django.db.models.deletion import Collector
+
+        from reviews.models import Comments, QueuedEmail, Review
+
+        _, reviews, _ = create_comments(admin_client, {user: user_client})
+        collector = Collector(using='default')
+        for model in (Comments, QueuedEmail):
+            assert collector.can_fast_delete(model.objects.all()), (
+                f'Проверьте, что обработчики сигналов не мешают удалять '
+                f'`{model.__name__}` каскадом одним запросом: подключайте '
+                'их с `sender`.'
+            )
+        with CaptureQueriesContext(connection) as context:
+            Review.objects.get(pk=reviews[0]['id']).delete()
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'reviews_comments' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что комментарии удаляемого отзыва не загружаются '
+            'в память.'
+        )
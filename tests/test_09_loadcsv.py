@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09LoadCSV:
+
+    def load(self, *args):
+        out = StringIO()
+        call_command('loadcsv', *args, stdout=out)
+        return out.getvalue()
+
+    def test_01_loadcsv(self, user_superuser, monkeypatch):
+        from api.management.commands import loadcsv
+        from reviews.models import Comments, Review, Title, TitleGenres
+
+        def parse_file(*args):
+            raise AssertionError(
+                'Проверьте, что по умолчанию `loadcsv` читает файлы '
+                'потоково, не разбирая их целиком в памяти.'
+            )
+
+        with monkeypatch.context() as patch:
+            patch.setattr(loadcsv, 'parse_file', parse_file)
+            output = self.load('--batch-size', '7')
+        assert 'строк/с' in output, (
+            'Проверьте, что команда `loadcsv` выводит скорость загрузки.'
+        )
+        counts = (
+            Title.objects.count(),
+            TitleGenres.objects.count(),
+            Review.objects.count(),
+            Comments.objects.count(),
+        )
+        assert all(counts), (
+            'Проверьте, что команда `loadcsv` загружает данные из CSV.'
+        )
+        title = Title.objects.filter(rating_count__gt=0).first()
+        assert title.rating == title.rating_sum / title.rating_count, (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг.'
+        )
+
+        self.load('--ignore-conflicts', '--workers', '2')
+        assert counts == (
+            Title.objects.count(),
+            TitleGenres.objects.count(),
+            Review.objects.count(),
+            Comments.objects.count(),
+        ), (
+            'Проверьте, что повторная загрузка с `--ignore-conflicts` '
+            'не дублирует данные.'
+        )
+
+        self.load('--truncate')
+        assert Review.objects.count() == counts[2]
+        assert type(user_superuser).objects.filter(
+            pk=user_superuser.pk
+        ).exists(), (
+            'Проверьте, что `--truncate` не удаляет суперпользователей.'
+        )
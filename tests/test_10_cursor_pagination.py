@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEWS_COUNT = 12
+
+    def create_reviews(self, admin_client, django_user_model):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        for idx in range(self.REVIEWS_COUNT):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                author=author, title_id=titles[0]['id'], text=str(idx),
+                score=5
+            )
+        return self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+    def test_01_cursor_walk(self, admin_client, client, django_user_model):
+        url = self.create_reviews(admin_client, django_user_model)
+        expected = [
+            review['id']
+            for page in (1, 2, 3)
+            for review in client.get(url, {'page': page}).json()['results']
+        ]
+        assert len(expected) == self.REVIEWS_COUNT
+
+        collected = []
+        next_url = f'{url}?cursor='
+        pages = []
+        with CaptureQueriesContext(connection) as queries:
+            while next_url:
+                response = client.get(next_url)
+                assert response.status_code == HTTPStatus.OK
+                data = response.json()
+                assert 'count' not in data, (
+                    'Проверьте, что пагинация курсором не возвращает `count`.'
+                )
+                pages.append([review['id'] for review in data['results']])
+                collected.extend(pages[-1])
+                next_url = data['next']
+        assert collected == expected, (
+            'Проверьте, что переход по ссылкам `next` курсорной пагинации '
+            'возвращает все отзывы в порядке публикации без повторов.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'].upper() for query in queries
+        ), 'Проверьте, что пагинация курсором не выполняет COUNT-запрос.'
+
+        previous_pages = []
+        previous_url = data['previous']
+        while previous_url:
+            data = client.get(previous_url).json()
+            previous_pages.insert(
+                0, [review['id'] for review in data['results']]
+            )
+            previous_url = data['previous']
+        assert previous_pages == pages[:-1], (
+            'Проверьте, что ссылки `previous` курсорной пагинации '
+            'возвращают предыдущие страницы.'
+        )
+
+    def test_02_invalid_cursor(self, admin_client, client,
+                               django_user_model):
+        url = self.create_reviews(admin_client, django_user_model)
+        response = client.get(url, {'cursor': 'invalid'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
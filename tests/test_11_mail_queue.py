@@ -0,0 +1,162 @@
+from http import HTTPStatus
+from io import StringIO
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+class TransactionCheckingEmailBackend(BaseEmailBackend):
+    in_atomic_block = []
+
+    def send_messages(self, email_messages):
+        from django.db import connection
+
+        self.in_atomic_block.append(connection.in_atomic_block)
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11MailQueue:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @pytest.fixture(autouse=True)
+    def database_mail_queue(self, settings):
+        settings.MAIL_QUEUE_BACKEND = 'api.mail.DatabaseMailQueue'
+
+    def signup(self, client):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'queued@yamdb.fake',
+            'username': 'queued'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при очереди писем в БД письмо не отправляется '
+            'во время обработки запроса.'
+        )
+
+    def test_01_send_queued(self, client):
+        from reviews.models import QueuedEmail
+
+        self.signup(client)
+        call_command('send_queued_emails', stdout=StringIO())
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда `send_queued_emails` отправляет письма '
+            'из очереди.'
+        )
+        assert mail.outbox[0].to == ['queued@yamdb.fake']
+        email = QueuedEmail.objects.get()
+        assert email.status == QueuedEmail.SENT
+        assert email.attempts == 1
+
+    def test_02_retry(self, client, settings):
+        from reviews.models import QueuedEmail
+
+        settings.EMAIL_BACKEND = (
+            'tests.test_11_mail_queue.FailingEmailBackend'
+        )
+        settings.MAIL_QUEUE_MAX_ATTEMPTS = 2
+        settings.MAIL_QUEUE_RETRY_DELAY = 0
+        self.signup(client)
+
+        call_command('send_queued_emails', stdout=StringIO())
+        email = QueuedEmail.objects.get()
+        assert email.status == QueuedEmail.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается как '
+            'неотправленное.'
+        )
+        assert email.attempts == 2
+        assert 'Сервер недоступен' in email.last_error
+
+    def test_03_send_outside_transaction(self, client, settings):
+        settings.EMAIL_BACKEND = (
+            'tests.test_11_mail_queue.TransactionCheckingEmailBackend'
+        )
+        TransactionCheckingEmailBackend.in_atomic_block.clear()
+        self.signup(client)
+        call_command('send_queued_emails', stdout=StringIO())
+        assert TransactionCheckingEmailBackend.in_atomic_block == [False], (
+            'Проверьте, что письма отправляются вне транзакции и не держат '
+            'блокировку базы на время работы с почтовым сервером.'
+        )
+
+    def test_04_claim_lease(self, client, settings):
+        from django.utils import timezone
+
+        from api.mail import claim_emails
+        from reviews.models import QueuedEmail
+
+        self.signup(client)
+        now = timezone.now()
+        owner, emails = claim_emails(10, now)
+        assert len(emails) == 1
+        assert QueuedEmail.objects.get().status == QueuedEmail.SENDING
+        assert claim_emails(10, now)[1] == [], (
+            'Проверьте, что занятое письмо не достаётся второму '
+            'обработчику.'
+        )
+        expired = now + timezone.timedelta(
+            seconds=settings.MAIL_QUEUE_LEASE_SECONDS + 1
+        )
+        other, emails = claim_emails(10, expired)
+        assert [email.claimed_by for email in emails] == [other], (
+            'Проверьте, что письмо с истёкшей арендой снова занимается.'
+        )
+        assert emails[0].attempts == 2
+
+    def test_05_abandoned_email_fails(self, client, settings):
+        from django.utils import timezone
+
+        from api.mail import claim_emails
+        from reviews.models import QueuedEmail
+
+        settings.MAIL_QUEUE_MAX_ATTEMPTS = 2
+        self.signup(client)
+        lease = timezone.timedelta(
+            seconds=settings.MAIL_QUEUE_LEASE_SECONDS + 1
+        )
+        now = timezone.now()
+        for _ in range(settings.MAIL_QUEUE_MAX_ATTEMPTS):
+            assert len(claim_emails(10, now)[1]) == 1
+            now += lease
+        assert claim_emails(10, now)[1] == [], (
+            'Проверьте, что письмо, на котором обработчик падал '
+            '`MAIL_QUEUE_MAX_ATTEMPTS` раз, больше не занимается.'
+        )
+        email = QueuedEmail.objects.get()
+        assert email.status == QueuedEmail.FAILED, (
+            'Проверьте, что такое письмо получает статус `failed`.'
+        )
+        assert email.attempts == settings.MAIL_QUEUE_MAX_ATTEMPTS
+
+    def test_06_sent_emails_purged(self, client, settings):
+        from django.utils import timezone
+
+        from reviews.models import QueuedEmail
+
+        self.signup(client)
+        call_command('send_queued_emails', stdout=StringIO())
+        client.post(self.URL_SIGNUP, data={
+            'email': 'second@yamdb.fake', 'username': 'second'
+        })
+        QueuedEmail.objects.filter(status=QueuedEmail.SENT).update(
+            sent_at=timezone.now() - timezone.timedelta(
+                seconds=settings.MAIL_QUEUE_SENT_RETENTION + 1
+            )
+        )
+        call_command('send_queued_emails', stdout=StringIO())
+        assert list(
+            QueuedEmail.objects.values_list('to_email', 'status')
+        ) == [('second@yamdb.fake', QueuedEmail.SENT)], (
+            'Проверьте, что отправленные письма старше '
+            '`MAIL_QUEUE_SENT_RETENTION` удаляются из очереди.'
+        )
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import jwt
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CachedAuthentication:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_ME = '/api/v1/users/me/'
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_token_claims(self, client, admin):
+        response = client.post(self.URL_TOKEN, data={
+            'username': admin.username,
+            'confirmation_code': default_token_generator.make_token(admin),
+        })
+        assert response.status_code == HTTPStatus.OK
+        claims = jwt.decode(
+            response.json()['token'], options={'verify_signature': False}
+        )
+        assert claims['user_id'] == admin.pk
+        assert not {'role', 'is_staff', 'is_superuser'} & set(claims), (
+            'Проверьте, что роль не записывается в токен: права берутся '
+            'из кэша пользователей и меняются без перевыпуска токена.'
+        )
+
+    def test_02_user_cached(self, user_client):
+        user_client.get(self.URL_TITLES)
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(self.URL_TITLES)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'reviews_user' in query['sql'] for query in queries
+        ), (
+            'Проверьте, что повторный запрос с тем же токеном не '
+            'обращается к таблице пользователей.'
+        )
+
+    def test_03_cache_invalidated(self, admin_client, user_client, user):
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение пользователя через `/api/v1/users/` '
+            'сбрасывает его запись в кэше аутентификации.'
+        )
+
+        response = user_client.patch(self.URL_ME, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.URL_ME).json()['bio'] == 'Новое'
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = user_client.get(self.URL_ME)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удалённый пользователь не остаётся в кэше '
+            'аутентификации.'
+        )
@@ -0,0 +1,43 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Metrics:
+
+    URL_METRICS = '/api/v1/metrics/'
+
+    def test_01_metrics_access(self, client, user_client, admin_client):
+        assert client.get(self.URL_METRICS).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.URL_METRICS).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что `{self.URL_METRICS}` доступен только '
+            'администратору.'
+        )
+        response = admin_client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+
+    def test_02_route_histograms(self, client, admin_client):
+        from api.metrics import registry
+
+        registry.clear()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        content = admin_client.get(self.URL_METRICS).content.decode()
+        for metric in (
+            'yamdb_request_queries',
+            'yamdb_request_db_seconds',
+            'yamdb_request_serializer_seconds',
+            'yamdb_request_duration_seconds',
+        ):
+            assert f'# TYPE {metric} histogram' in content
+            assert f'{metric}_count{{route="title-list"}} 2' in content, (
+                'Проверьте, что метрики собираются по имени маршрута.'
+            )
+        assert 'yamdb_request_queries_bucket{route="title-list",le="+Inf"} 2' \
+            in content
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'терминат') == ['Терминатор'], (
+            f'Проверьте, что `{self.TITLES_URL}?search=` находит '
+            'произведение по началу слова из названия.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            f'Проверьте, что `{self.TITLES_URL}?search=` ищет по описанию.'
+        )
+        assert self.search(client, 'нетакогослова') == []
+
+    def test_02_ranking(self, admin_client, client):
+        create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Орешек знаний',
+            'year': 2001,
+            'genre': ['drama'],
+            'category': 'books',
+            'description': 'Терминатор упоминается только здесь',
+        })
+        assert self.search(client, 'терминатор') == [
+            'Терминатор', 'Орешек знаний'
+        ], (
+            'Проверьте, что совпадение в названии ранжируется выше '
+            'совпадения в описании.'
+        )
+
+    def test_03_index_sync(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        admin_client.patch(url, data={
+            'name': 'Робокоп',
+            'genre': titles[0]['genre'],
+            'category': titles[0]['category'],
+        })
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'робокоп') == ['Робокоп'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(url)
+        assert self.search(client, 'робокоп') == [], (
+            'Проверьте, что удалённое произведение пропадает из поиска.'
+        )
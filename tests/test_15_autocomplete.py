@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Autocomplete:
+
+    URL = '/api/v1/autocomplete/'
+
+    def test_01_prefix(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.URL, {'q': 'Кр'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['titles'][0]['name'] == 'Крепкий орешек', (
+            f'Проверьте, что `{self.URL}` находит произведение по началу '
+            'названия.'
+        )
+        assert data['categories'] == [] and data['genres'] == []
+
+        data = client.get(self.URL, {'q': 'ореш', 'type': 'titles'}).json()
+        assert [title['name'] for title in data['titles']] == [
+            'Крепкий орешек'
+        ], 'Проверьте, что подсказки ищутся по началу любого слова.'
+        assert list(data) == ['titles']
+
+        data = client.get(self.URL, {'q': 'ко', 'type': 'genres'}).json()
+        assert data['genres'] == [{'name': 'Комедия', 'slug': 'comedy'}]
+
+    def test_02_typo_and_limit(self, admin_client, client):
+        create_titles(admin_client)
+        data = client.get(
+            self.URL, {'q': 'Терменатор', 'type': 'titles'}
+        ).json()
+        assert [title['name'] for title in data['titles']] == [
+            'Терминатор'
+        ], 'Проверьте, что подсказки находят названия с опечатками.'
+
+        data = client.get(
+            self.URL, {'q': 'д', 'type': 'genres,categories', 'limit': 1}
+        ).json()
+        assert len(data['genres']) == 1
+
+        response = client.get(self.URL, {'q': 'д', 'type': 'users'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_refresh_on_change(self, admin_client, client):
+        create_titles(admin_client)
+        assert client.get(
+            self.URL, {'q': 'арт', 'type': 'genres'}
+        ).json()['genres'] == []
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Артхаус', 'slug': 'arthouse'}
+        )
+        assert client.get(
+            self.URL, {'q': 'арт', 'type': 'genres'}
+        ).json()['genres'] == [{'name': 'Артхаус', 'slug': 'arthouse'}], (
+            'Проверьте, что новый жанр сразу появляется в подсказках.'
+        )
+        admin_client.delete('/api/v1/genres/arthouse/')
+        assert client.get(
+            self.URL, {'q': 'арт', 'type': 'genres'}
+        ).json()['genres'] == [], (
+            'Проверьте, что удалённый жанр пропадает из подсказок.'
+        )
+
+    def test_04_background_build(self, admin_client, client,
+                                 django_assert_num_queries):
+        from api.autocomplete import autocomplete_index
+
+        create_titles(admin_client)
+        autocomplete_index.clear()
+        autocomplete_index.start().join()
+        with django_assert_num_queries(0):
+            data = client.get(self.URL, {'q': 'Кр'}).json()
+        assert data['titles'][0]['name'] == 'Крепкий орешек', (
+            'Проверьте, что индекс подсказок строится при запуске, а не '
+            'при первом запросе.'
+        )
+
+    def test_05_rebuild_off_lock(self, admin_client, client, monkeypatch,
+                                 settings):
+        from api import autocomplete
+        from api.autocomplete import autocomplete_index
+
+        create_titles(admin_client)
+        client.get(self.URL, {'q': 'Кр', 'type': 'titles'})
+        old_index = autocomplete_index._indexes['titles'][0]
+        settings.AUTOCOMPLETE_MAX_AGE = 0
+        locked = []
+        original = autocomplete.KindIndex
+
+        def slow_index(items):
+            locked.append(autocomplete_index._lock.locked())
+            index = original(items)
+            admin_client.post(
+                '/api/v1/titles/', data={'name': 'Крокодил', 'year': 1990,
+                                         'category': 'films'}
+            )
+            return index
+
+        monkeypatch.setattr(autocomplete, 'KindIndex', slow_index)
+        monkeypatch.setattr(
+            autocomplete_index, 'build_in_background',
+            lambda *kinds: [autocomplete_index.build(kind) for kind in kinds]
+        )
+        client.get(self.URL, {'q': 'Кр', 'type': 'titles'})
+        assert locked == [False], (
+            'Проверьте, что индекс перестраивается без блокировки, которую '
+            'ждут запросы подсказок.'
+        )
+        assert autocomplete_index._indexes['titles'][0] is not old_index
+        settings.AUTOCOMPLETE_MAX_AGE = 300
+        data = client.get(self.URL, {'q': 'Кр', 'type': 'titles'}).json()
+        assert [title['name'] for title in data['titles']] == [
+            'Крепкий орешек', 'Крокодил'
+        ], (
+            'Проверьте, что изменения, пришедшие во время перестроения, '
+            'не теряются при замене индекса.'
+        )
+
+    def test_06_similar_skips_common_trigrams(self, monkeypatch):
+        from api import autocomplete
+
+        monkeypatch.setattr(autocomplete, 'MAX_POSTING_SIZE', 10)
+        index = autocomplete.KindIndex(
+            [{'key': idx, 'name': f'Фильм {idx}'} for idx in range(100)]
+            + [{'key': -1, 'name': 'Терминатор'}]
+        )
+        assert [item['key'] for item in index.lookup('Терменатор', 5)] == [
+            -1
+        ], 'Проверьте, что подсказки находят названия с опечатками.'
+        assert len(index.trigrams['фил']) > autocomplete.MAX_POSTING_SIZE
+        assert index.similar('филмь', 5, ()) == [], (
+            'Проверьте, что при поиске похожих названий пропускаются '
+            'триграммы, которые встречаются слишком часто.'
+        )
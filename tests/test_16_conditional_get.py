@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    URLS = (
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        '/api/v1/titles/',
+    )
+
+    def test_01_not_modified(self, admin_client, client,
+                             django_assert_num_queries):
+        create_titles(admin_client)
+        for url in self.URLS:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response.get('ETag')
+            assert etag and etag.startswith('"'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'сильный ETag.'
+            )
+            assert response.get('Last-Modified'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `Last-Modified`.'
+            )
+            with django_assert_num_queries(1):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает 304 одним запросом к БД.'
+            )
+            assert response.content == b''
+            assert response['ETag'] == etag
+
+    def test_02_etag_changes_on_write(self, admin_client, client,
+                                      user_client):
+        titles, categories, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        detail_url = f'{url}{titles[0]["id"]}/'
+        detail_etag = client.get(detail_url)['ETag']
+
+        user_client.post(
+            f'{url}{titles[0]["id"]}/reviews/', data={'text': 'Да', 'score': 7}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка произведений, '
+            'так как меняется рейтинг.'
+        )
+        assert response['ETag'] != etag
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        assert response.status_code == HTTPStatus.OK
+
+        etag = response['ETag']
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление категории меняет ETag произведений.'
+        )
+
+        genres_etag = client.get('/api/v1/genres/')['ETag']
+        response = client.get(
+            '/api/v1/genres/', HTTP_IF_NONE_MATCH=genres_etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что изменения других таблиц не меняют ETag жанров.'
+        )
+
+    def test_03_renderer_in_etag(self, admin_client, client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        response = client.get(
+            url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag различается для разных форматов ответа.'
+        )
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_cached_list(self, admin_client, client,
+                            django_assert_num_queries):
+        create_titles(admin_client)
+        for url in ('/api/v1/categories/', '/api/v1/genres/',
+                    self.TITLES_URL):
+            expected = client.get(url).json()
+            with django_assert_num_queries(1):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == expected, (
+                f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+                'кэша одним запросом к таблице версий.'
+            )
+
+    def test_02_normalized_query(self, admin_client, client,
+                                 django_assert_num_queries):
+        create_titles(admin_client)
+        first = client.get(
+            self.TITLES_URL + '?year=1988&genre=comedy&search='
+        ).json()
+        with django_assert_num_queries(1):
+            second = client.get(
+                self.TITLES_URL + '?genre=comedy&year=1988'
+            ).json()
+        assert first == second, (
+            'Проверьте, что порядок параметров запроса и пустые параметры '
+            'не влияют на ключ кэша.'
+        )
+        assert client.get(self.TITLES_URL + '?year=1984').json() != first
+
+    def test_03_invalidation(self, admin_client, client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        assert client.get(self.TITLES_URL).json()['count'] == 2
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое', 'year': 2000,
+            'genre': ['comedy'], 'category': 'films',
+        })
+        assert client.get(self.TITLES_URL).json()['count'] == 3, (
+            'Проверьте, что создание произведения сбрасывает кэш списка.'
+        )
+
+        user_client.post(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/',
+            data={'text': 'Да', 'score': 7},
+        )
+        ratings = {
+            title['id']: title['rating']
+            for title in client.get(self.TITLES_URL).json()['results']
+        }
+        assert ratings[titles[0]['id']] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш списка произведений.'
+        )
+
+        genres = client.get('/api/v1/genres/').json()
+        admin_client.delete(f'/api/v1/genres/{genres["results"][0]["slug"]}/')
+        assert client.get('/api/v1/genres/').json()['count'] == (
+            genres['count'] - 1
+        ), 'Проверьте, что удаление жанра сбрасывает кэш списка жанров.'
@@ -0,0 +1,41 @@
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18FastSerializers:
+
+    def get_both(self, client, settings, url, **params):
+        settings.FAST_SERIALIZERS_ENABLED = True
+        fast = client.get(url, params)
+        settings.FAST_SERIALIZERS_ENABLED = False
+        regular = client.get(url, params)
+        assert fast.status_code == regular.status_code
+        return fast.content, regular.content
+
+    def test_01_identical_output(self, admin_client, client, user_client,
+                                 user, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        admin_client.delete('/api/v1/categories/books/')
+        urls = (
+            ('/api/v1/titles/', {}),
+            ('/api/v1/titles/', {'genre': 'comedy'}),
+            ('/api/v1/titles/', {'search': 'back'}),
+            (f'/api/v1/titles/{titles[0]["id"]}/reviews/', {}),
+            (f'/api/v1/titles/{titles[0]["id"]}/reviews/', {'cursor': ''}),
+            (
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                f'{reviews[0]["id"]}/comments/',
+                {},
+            ),
+        )
+        for url, params in urls:
+            fast, regular = self.get_both(client, settings, url, **params)
+            assert fast == regular, (
+                f'Проверьте, что быстрый сериализатор для `{url}` с '
+                f'параметрами {params} выдаёт тот же JSON, что и обычный.'
+            )
@@ -0,0 +1,47 @@
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Renderer:
+
+    def test_01_streaming_matches_regular(self, admin_client, client,
+                                          user_client, user, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/',
+        )
+        for url in urls:
+            settings.JSON_STREAM_MIN_ITEMS = 1000
+            regular = client.get(url)
+            assert not regular.streaming
+            settings.JSON_STREAM_MIN_ITEMS = 1
+            settings.JSON_STREAM_CHUNK_SIZE = 1
+            streamed = client.get(url)
+            assert streamed.streaming, (
+                f'Проверьте, что большие списки `{url}` отдаются потоком.'
+            )
+            assert streamed['Content-Type'] == regular['Content-Type']
+            assert b''.join(streamed.streaming_content) == regular.content, (
+                f'Проверьте, что потоковый ответ `{url}` совпадает с '
+                'обычным.'
+            )
+
+    def test_02_browsable_api_not_streamed(self, admin_client, client,
+                                           settings):
+        create_comments(admin_client, {})
+        settings.JSON_STREAM_MIN_ITEMS = 1
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='text/html')
+        assert not response.streaming
+        response = client.get(
+            '/api/v1/titles/', HTTP_ACCEPT='application/json; indent=2'
+        )
+        assert not response.streaming
+        assert b'\n  ' in response.content
@@ -0,0 +1,108 @@
+import csv
+from http import HTTPStatus
+import io
+import json
+
+import pytest
+
+from tests.utils import asgi_get, create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Export:
+
+    URL_TEMPLATE = '/api/v1/export/{table}.{extension}'
+
+    def test_01_permissions(self, user_client, client, moderator_client):
+        url = self.URL_TEMPLATE.format(table='titles', extension='csv')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        for role_client in (user_client, moderator_client):
+            assert role_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что выгрузка доступна только администратору.'
+            )
+
+    def test_02_unknown(self, admin_client):
+        for table, extension in (('users', 'csv'), ('titles', 'xml')):
+            url = self.URL_TEMPLATE.format(table=table, extension=extension)
+            assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_round_trip(self, admin_client, user_client, user):
+        from django.forms.models import model_to_dict
+
+        from api.management.commands.loadcsv import (
+            Command,
+            load_comments,
+            load_reviews,
+            load_titles,
+        )
+        from reviews.models import Comments, Review, Title
+
+        create_comments(admin_client, {user: user_client})
+        tables = (
+            ('titles', Title, load_titles),
+            ('reviews', Review, load_reviews),
+            ('comments', Comments, load_comments),
+        )
+        skipped = ('genre', 'rating', 'rating_sum', 'rating_count')
+        exported, expected = {}, {}
+        for table, model, _ in tables:
+            url = self.URL_TEMPLATE.format(table=table, extension='csv')
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.streaming, (
+                f'Проверьте, что `{url}` отдаёт выгрузку потоком.'
+            )
+            content = b''.join(response.streaming_content).decode()
+            exported[table] = list(csv.reader(io.StringIO(content)))[1:]
+            assert len(exported[table]) == model.objects.count()
+            expected[table] = [
+                model_to_dict(obj, exclude=skipped)
+                | {'pub_date': getattr(obj, 'pub_date', None)}
+                for obj in model.objects.order_by('pk')
+            ]
+        Title.objects.all().delete()
+        command = Command()
+        for table, model, load in tables:
+            command.load_file(
+                f'{table}.csv', [exported[table]], model, load, {},
+                {'ignore_conflicts': False},
+            )
+            stored = [
+                model_to_dict(obj, exclude=skipped)
+                | {'pub_date': getattr(obj, 'pub_date', None)}
+                for obj in model.objects.order_by('pk')
+            ]
+            assert stored == expected[table], (
+                f'Проверьте, что выгрузка `{table}` загружается обратно '
+                'командой loadcsv без изменений, включая `pub_date`.'
+            )
+
+    def test_04_ndjson(self, admin_client, user_client, user):
+        _, reviews, _ = create_comments(admin_client, {user: user_client})
+        url = self.URL_TEMPLATE.format(table='reviews', extension='ndjson')
+        response = admin_client.get(url)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        data = [json.loads(line) for line in lines]
+        assert [row['id'] for row in data] == sorted(
+            review['id'] for review in reviews
+        )
+        assert list(data[0]) == [
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        ]
+        assert data[0]['pub_date'].endswith('Z')
+
+    def test_05_asgi(self, admin_client, user_client, user, token_admin):
+        create_comments(admin_client, {user: user_client})
+        for table in ('titles', 'reviews', 'comments'):
+            for extension in ('csv', 'ndjson'):
+                url = self.URL_TEMPLATE.format(
+                    table=table, extension=extension
+                )
+                expected = b''.join(admin_client.get(url).streaming_content)
+                status, content = asgi_get(url, token_admin['access'])
+                assert status == HTTPStatus.OK
+                assert content == expected, (
+                    f'Проверьте, что `{url}` под ASGI отдаёт выгрузку '
+                    'целиком.'
+                )
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21PageSizeFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_page_size(self, admin_client, client, settings):
+        create_comments(admin_client, {})
+        for idx in range(8):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}', 'year': 2000,
+                'genre': ['comedy'], 'category': 'films',
+            })
+        response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 5
+        data = client.get(self.TITLES_URL, {'page_size': 7}).json()
+        assert len(data['results']) == 7, (
+            'Проверьте, что параметр `page_size` задаёт размер страницы.'
+        )
+        assert 'page_size=7' in data['next']
+
+        settings.MAX_PAGE_SIZE = 3
+        data = client.get(self.TITLES_URL, {'page_size': 100}).json()
+        assert len(data['results']) == 3, (
+            'Проверьте, что размер страницы ограничен `MAX_PAGE_SIZE`.'
+        )
+
+    def test_02_sparse_fields(self, admin_client, client, user_client, user,
+                              django_assert_num_queries):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        comment_id = client.get(comments_url).json()['results'][0]['id']
+        for url, fields in (
+            (self.TITLES_URL, 'id,name'),
+            (self.TITLES_URL, 'category,rating'),
+            (self.TITLES_URL, 'genre'),
+            (f'{self.TITLES_URL}{titles[0]["id"]}/', 'name,category,genre'),
+            (reviews_url, 'author,score'),
+            (reviews_url + '?cursor=', 'text'),
+            (f'{reviews_url}{reviews[0]["id"]}/', 'id,author'),
+            (comments_url, 'text'),
+            (f'{comments_url}{comment_id}/', 'review,pub_date'),
+        ):
+            full = client.get(url).json()
+            response = client.get(url, {'fields': fields})
+            assert response.status_code == HTTPStatus.OK, (url, fields)
+            data = response.json()
+            expected = full.get('results', [full])
+            trimmed = data.get('results', [data])
+            assert trimmed == [
+                {name: item[name] for name in item if name in fields}
+                for item in expected
+            ], (
+                f'Проверьте, что параметр `fields={fields}` оставляет в '
+                f'ответе `{url}` только перечисленные поля.'
+            )
+
+        response = client.get(self.TITLES_URL, {'fields': 'name,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_select_columns(self, admin_client, client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        _, _, titles = create_comments(admin_client, {})
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        for query_url in (self.TITLES_URL, url):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(query_url, {'fields': 'name'})
+            assert response.status_code == HTTPStatus.OK
+            selects = [
+                query['sql'] for query in queries
+                if query['sql'].startswith('SELECT')
+                and '"reviews_title"."name"' in query['sql']
+            ]
+            assert selects and all(
+                '"description"' not in sql and '"reviews_category"' not in sql
+                for sql in selects
+            ), (
+                'Проверьте, что параметр `fields` сокращает список '
+                'столбцов в SELECT.'
+            )
@@ -0,0 +1,141 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22BulkCreate:
+
+    REVIEWS_URL = '/api/v1/reviews/bulk/'
+    COMMENTS_URL = '/api/v1/comments/bulk/'
+
+    def test_01_reviews(self, admin_client, user_client, client, user):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'title': titles[0]['id'], 'text': 'Первый', 'score': 4},
+            {'title': titles[1]['id'], 'text': 'Второй', 'score': 9},
+        ]
+        assert client.post(
+            self.REVIEWS_URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.REVIEWS_URL, data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        created = response.json()
+        assert [review['text'] for review in created] == ['Первый', 'Второй']
+        for review in created:
+            assert review['author'] == user.username
+            detail = client.get(
+                f'/api/v1/titles/{review["title"]}/reviews/{review["id"]}/'
+            ).json()
+            assert detail == review, (
+                'Проверьте, что ответ массового создания содержит id и '
+                'данные созданных отзывов.'
+            )
+        ratings = {
+            title['id']: title['rating']
+            for title in client.get('/api/v1/titles/').json()['results']
+        }
+        assert ratings == {titles[0]['id']: 4, titles[1]['id']: 9}, (
+            'Проверьте, что массовое создание отзывов обновляет рейтинг.'
+        )
+
+    def test_02_reviews_errors(self, admin_client, user_client, user, admin):
+        titles, _, _ = create_titles(admin_client)
+        user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Уже есть', 'score': 5},
+        )
+        data = [
+            {'title': titles[0]['id'], 'text': 'Повтор', 'score': 4},
+            {'title': titles[1]['id'], 'text': 'Хороший', 'score': 7},
+            {'title': titles[1]['id'], 'text': 'Дубль', 'score': 7},
+            {'title': 9999, 'text': 'Нет', 'score': 7},
+            {'title': titles[1]['id'], 'text': 'Оценка', 'score': 11},
+            {'title': titles[1]['id'], 'text': 'Автор', 'score': 1,
+             'author': admin.username},
+        ]
+        response = user_client.post(self.REVIEWS_URL, data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == len(data)
+        assert [set(item) for item in errors] == [
+            {'non_field_errors'}, set(), {'non_field_errors'}, {'title'},
+            {'score'}, {'author'},
+        ], 'Проверьте, что ошибки возвращаются для каждого объекта.'
+        assert admin_client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        ).json()['count'] == 0, (
+            'Проверьте, что при ошибках ни один отзыв не создаётся.'
+        )
+
+        response = admin_client.post(self.REVIEWS_URL, [
+            {'title': titles[1]['id'], 'text': 'За автора', 'score': 3,
+             'author': user.username},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()[0]['author'] == user.username
+        assert user_client.post(
+            self.REVIEWS_URL, [], format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_queries_do_not_grow(self, admin_client, user_client,
+                                    django_assert_max_num_queries):
+        create_titles(admin_client)
+        review = user_client.post(self.REVIEWS_URL, [
+            {'title': admin_client.get('/api/v1/titles/').json()[
+                'results'][0]['id'], 'text': 'Отзыв', 'score': 5},
+        ], format='json').json()[0]
+        for size in (2, 50):
+            data = [
+                {'review': review['id'], 'text': f'Комментарий {idx}'}
+                for idx in range(size)
+            ]
+            with django_assert_max_num_queries(6):
+                response = user_client.post(
+                    self.COMMENTS_URL, data, format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            ids = [comment['id'] for comment in response.json()]
+            assert len(set(ids)) == size
+        comments = admin_client.get(
+            f'/api/v1/titles/{review["title"]}/reviews/{review["id"]}/'
+            'comments/', {'page_size': 100}
+        ).json()
+        assert comments['count'] == 52
+        assert {comment['id'] for comment in comments['results']} >= set(ids)
+
+        response = user_client.post(
+            self.COMMENTS_URL, [{'review': 9999, 'text': 'Нет'}],
+            format='json',
+        )
+        assert response.json() == [{'review': ['Отзыв не найден.']}]
+
+    def test_04_review_ratings_in_one_update(self, admin_client, user_client,
+                                             client,
+                                             django_assert_max_num_queries):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        Title.objects.bulk_create([
+            Title(name=f'Произведение {idx}', year=2000,
+                  category_id=title.category_id)
+            for idx in range(20)
+        ])
+        title_ids = list(Title.objects.values_list('pk', flat=True))
+        data = [
+            {'title': title_id, 'text': 'Отзыв', 'score': idx % 10 + 1}
+            for idx, title_id in enumerate(title_ids)
+        ]
+        with django_assert_max_num_queries(8):
+            response = user_client.post(self.REVIEWS_URL, data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что рейтинги произведений пакета обновляются одним '
+            'запросом, а число запросов не зависит от числа произведений.'
+        )
+        ratings = dict(Title.objects.values_list('pk', 'rating'))
+        assert ratings == {
+            item['title']: item['score'] for item in data
+        }, 'Проверьте, что массовое создание отзывов обновляет рейтинг.'
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkTitles:
+
+    URL = '/api/v1/titles/bulk/'
+
+    def test_01_permissions(self, user_client, moderator_client):
+        for role_client in (user_client, moderator_client):
+            response = role_client.post(self.URL, [], format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что массовое изменение произведений доступно '
+                'только администратору.'
+            )
+
+    def test_02_create_update(self, admin_client, client,
+                              django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'name': f'Фильм {idx}', 'year': 2000 + idx,
+             'category': 'films', 'genre': ['drama', 'comedy']}
+            for idx in range(20)
+        ]
+        data.append({'id': titles[0]['id'], 'name': 'Новое название',
+                     'genre': ['drama']})
+        data.append({'id': 5000, 'name': 'С id', 'year': 1999,
+                     'category': 'books'})
+        with django_assert_max_num_queries(20):
+            response = admin_client.post(self.URL, data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        result = response.json()
+        assert result['created'] == 21 and result['updated'] == 1
+        assert result['ids'][-2:] == [titles[0]['id'], 5000]
+        assert len(set(result['ids'])) == 22
+
+        created = client.get(f'/api/v1/titles/{result["ids"][3]}/').json()
+        assert created['name'] == 'Фильм 3'
+        assert created['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert {genre['slug'] for genre in created['genre']} == {
+            'drama', 'comedy'
+        }
+        updated = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert updated['name'] == 'Новое название'
+        assert updated['year'] == titles[0]['year'], (
+            'Проверьте, что непереданные поля не меняются.'
+        )
+        assert [genre['slug'] for genre in updated['genre']] == ['drama']
+        assert client.get('/api/v1/titles/5000/').json()['name'] == 'С id'
+
+        found = client.get('/api/v1/titles/', {'search': 'Новое'}).json()
+        assert [title['id'] for title in found['results']] == [
+            titles[0]['id']
+        ], 'Проверьте, что изменения попадают в поисковый индекс.'
+        suggestions = client.get(
+            '/api/v1/autocomplete/', {'q': 'Фильм 1', 'type': 'titles'}
+        ).json()['titles']
+        assert suggestions, (
+            'Проверьте, что новые произведения появляются в подсказках.'
+        )
+
+    def test_03_errors(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'name': 'Без года', 'category': 'films'},
+            {'name': 'Нет категории', 'year': 2000, 'category': 'nope'},
+            {'id': titles[0]['id'], 'genre': ['drama', 'nope']},
+            {'id': titles[0]['id'], 'name': 'Дважды'},
+            {'name': 'Хорошее', 'year': 2000, 'category': 'films'},
+            {'name': 'Будущее', 'year': 3000, 'category': 'films'},
+        ]
+        response = admin_client.post(self.URL, data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert [set(item) for item in response.json()] == [
+            {'year'}, {'category'}, {'genre'}, {'id'}, set(), {'year'},
+        ]
+        assert client.get('/api/v1/titles/').json()['count'] == 2
@@ -0,0 +1,64 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api_yamdb.backends.sqlite.base import DatabaseWrapper
+from tests.utils import make_wrapper
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SQLiteBackend:
+
+    def test_01_pragmas_applied(self, tmp_path, settings):
+        wrapper = make_wrapper(
+            tmp_path / 'db.sqlite3', pragmas=settings.SQLITE_PRAGMAS
+        )
+        try:
+            expected = {
+                'journal_mode': 'wal',
+                'synchronous': 1,
+                'temp_store': 2,
+                'busy_timeout': settings.SQLITE_PRAGMAS['busy_timeout'],
+                'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+                'foreign_keys': 1,
+            }
+            for name, value in expected.items():
+                assert pragma(wrapper, name) == value, (
+                    f'Проверьте, что при соединении выполняется PRAGMA '
+                    f'{name} из настроек.'
+                )
+        finally:
+            wrapper.close()
+
+    def test_02_default_connection_uses_backend(self):
+        assert connection.vendor == 'sqlite'
+        assert isinstance(connections['default'], DatabaseWrapper), (
+            'Проверьте, что в DATABASES подключён бэкенд '
+            '`api_yamdb.backends.sqlite`.'
+        )
+        assert pragma(connection, 'synchronous') == 1
+
+    def test_03_transaction_mode(self):
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                pass
+        assert context.captured_queries[0]['sql'] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что `transaction.atomic` начинает транзакцию в '
+            'режиме из `OPTIONS.transaction_mode`.'
+        )
+
+    @pytest.mark.parametrize('options', (
+        {'pragmas': {'journal_mode; DROP TABLE x': 'WAL'}},
+        {'pragmas': {'journal_mode': 'WAL; DROP TABLE x'}},
+        {'transaction_mode': 'LAZY'},
+    ))
+    def test_04_invalid_options(self, tmp_path, options):
+        with pytest.raises(ImproperlyConfigured):
+            make_wrapper(tmp_path / 'db.sqlite3', **options)
@@ -0,0 +1,179 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.fixture
+def sync_replica(settings):
+    """Включает чтение с реплики и возвращает функцию её синхронизации."""
+    settings.DATABASE_REPLICAS = ('replica',)
+
+    def sync():
+        for alias in ('default', 'replica'):
+            connections[alias].ensure_connection()
+        connections['default'].connection.backup(
+            connections['replica'].connection
+        )
+
+    return sync
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class Test25Replicas:
+
+    def test_01_reads_go_to_replica(self, admin_client, user_client, user,
+                                    client, sync_replica):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        sync_replica()
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        )
+        for url in urls:
+            with CaptureQueriesContext(connections['default']) as primary:
+                with CaptureQueriesContext(
+                    connections['replica']
+                ) as replica:
+                    response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert replica.captured_queries and all(
+                'reviews_tableversion' in query['sql']
+                for query in primary.captured_queries
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` читает с реплики, '
+                'а с основной базы - только версии таблиц.'
+            )
+
+    def test_02_writer_pinned_to_primary(self, admin_client, user_client,
+                                         client, sync_replica):
+        titles, _, _ = create_titles(admin_client)
+        sync_replica()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Свежий', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(url).json()['results'] == [], (
+            'Реплика ещё не синхронизирована, отзыва на ней быть не должно.'
+        )
+        assert [
+            review['text'] for review in user_client.get(url).json()['results']
+        ] == ['Свежий'], (
+            'Проверьте, что после записи пользователь читает с основной '
+            'базы и сразу видит свой отзыв.'
+        )
+        caches['default'].clear()
+        assert user_client.get(url).json()['results'] == [], (
+            'Проверьте, что по истечении окна пользователь снова читает с '
+            'реплики.'
+        )
+        sync_replica()
+        assert len(client.get(url).json()['results']) == 1
+
+    def test_03_bulk_write_pins(self, admin_client, user_client,
+                                sync_replica):
+        titles, _, _ = create_titles(admin_client)
+        sync_replica()
+        response = user_client.post(
+            '/api/v1/reviews/bulk/',
+            [{'title': titles[0]['id'], 'text': 'Пакет', 'score': 5}],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        reviews = user_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ).json()['results']
+        assert len(reviews) == 1, (
+            'Проверьте, что массовая запись тоже закрепляет пользователя за '
+            'основной базой.'
+        )
+
+    def test_04_failed_write_does_not_pin(self, admin_client, user_client,
+                                          sync_replica):
+        titles, _, _ = create_titles(admin_client)
+        sync_replica()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': '', 'score': 70})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        with CaptureQueriesContext(connections['replica']) as replica:
+            user_client.get(url)
+        assert replica.captured_queries, (
+            'Проверьте, что запрос с ошибкой не закрепляет пользователя за '
+            'основной базой.'
+        )
+
+    def test_05_replica_objects_saved_to_primary(self, admin_client,
+                                                 sync_replica):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        sync_replica()
+        title = Title.objects.using('replica').get(pk=titles[0]['id'])
+        title.name = 'Новое название'
+        title.save()
+        assert Title.objects.get(pk=title.pk).name == 'Новое название', (
+            'Проверьте, что объект, прочитанный с реплики, сохраняется в '
+            'основную базу.'
+        )
+        assert Title.objects.using('replica').get(
+            pk=title.pk
+        ).name == titles[0]['name']
+
+    def test_06_alias_reset_after_exception(self, admin_client, user_client,
+                                            client, sync_replica,
+                                            monkeypatch):
+        from api.replicas import _read_alias
+        from api.views import CategoryViewSet
+
+        create_titles(admin_client)
+        sync_replica()
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('Сбой вьюхи')
+
+        monkeypatch.setattr(CategoryViewSet, 'list', fail)
+        with pytest.raises(RuntimeError):
+            client.get('/api/v1/categories/')
+        assert _read_alias.get() is None, (
+            'Проверьте, что алиас реплики сбрасывается, даже если вьюха '
+            'упала с исключением.'
+        )
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert not replica.captured_queries, (
+            'Проверьте, что после ошибки в вьюхе каталога остальные '
+            'запросы читают с основной базы.'
+        )
+
+    def test_07_versions_read_from_primary(self, admin_client, client,
+                                           sync_replica):
+        from reviews.models import TableVersion
+
+        create_titles(admin_client)
+        sync_replica()
+        TableVersion.objects.using('replica').all()._raw_delete('replica')
+        versions = dict(
+            TableVersion.objects.values_list('table', 'version')
+        )
+        response = client.get('/api/v1/categories/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что список отдаётся, даже если на реплике ещё нет '
+            'версий таблиц.'
+        )
+        assert dict(
+            TableVersion.objects.values_list('table', 'version')
+        ) == versions, (
+            'Проверьте, что GET-запрос не увеличивает версии таблиц.'
+        )
@@ -0,0 +1,152 @@
+import sqlite3
+from threading import Thread
+
+import pytest
+
+from api_yamdb.backends.sqlite.base import check_usable
+from api_yamdb.backends.sqlite.pool import ConnectionPool, pools
+from tests.utils import make_wrapper
+
+
+@pytest.fixture
+def pool_alias():
+    alias = 'pool_test'
+    yield alias
+    pool = pools.pop(alias, None)
+    if pool is not None:
+        pool.close()
+
+
+def memory_connection():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+class Test26ConnectionPool:
+
+    def test_01_reuse_and_stats(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        first = pool.acquire(memory_connection)
+        assert pool.stats()['in_use'] == 1
+        pool.release(first)
+        assert pool.stats()['idle'] == 1
+        assert pool.acquire(memory_connection) is first, (
+            'Проверьте, что пул выдаёт освобождённое соединение повторно.'
+        )
+        assert pool.stats() == {
+            'max_size': 2, 'in_use': 1, 'idle': 0, 'waits': 0,
+            'wait_seconds': 0, 'timeouts': 0,
+        }
+        pool.close()
+
+    def test_02_wait_and_timeout(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        conn = pool.acquire(memory_connection)
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire(memory_connection)
+        stats = pool.stats()
+        assert stats['waits'] == 1 and stats['timeouts'] == 1
+        assert stats['wait_seconds'] >= 0.05, (
+            'Проверьте, что время ожидания соединения учитывается.'
+        )
+        pool.timeout = 5
+        acquired = []
+        thread = Thread(
+            target=lambda: acquired.append(pool.acquire(memory_connection))
+        )
+        thread.start()
+        pool.release(conn)
+        thread.join()
+        assert acquired == [conn]
+        assert pool.stats()['waits'] == 2
+        pool.close()
+
+    def test_03_broken_connection_replaced(self):
+        pool = ConnectionPool(max_size=1, timeout=1)
+        conn = pool.acquire(memory_connection)
+        conn.execute('BEGIN')
+        pool.release(conn)
+        assert not conn.in_transaction, (
+            'Проверьте, что незавершённая транзакция откатывается при '
+            'возврате соединения в пул.'
+        )
+        conn.close()
+        fresh = pool.acquire(memory_connection, check_usable)
+        assert fresh is not conn
+        fresh.execute('SELECT 1')
+        assert pool.stats()['in_use'] == 1
+        pool.close()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Backend:
+
+    def test_01_pooled_wrapper(self, tmp_path, pool_alias):
+        wrapper = make_wrapper(
+            tmp_path / 'db.sqlite3', alias=pool_alias,
+            pool={'max_size': 2, 'timeout': 1},
+        )
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        assert pools[pool_alias].stats()['idle'] == 1, (
+            'Проверьте, что закрытие соединения возвращает его в пул.'
+        )
+        other = make_wrapper(
+            tmp_path / 'db.sqlite3', alias=pool_alias,
+            pool={'max_size': 2, 'timeout': 1},
+        )
+        with other.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        assert other.connection is raw
+        assert pools[pool_alias].stats()['in_use'] == 1
+        other.close()
+
+    def test_02_health_check(self, tmp_path):
+        wrapper = make_wrapper(
+            tmp_path / 'db.sqlite3',
+            settings_dict={'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+        )
+        wrapper.ensure_connection()
+        wrapper.close_if_unusable_or_obsolete()
+        wrapper.connection.close()
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            assert cursor.fetchone() == (1,), (
+                'Проверьте, что перед повторным использованием соединение '
+                'проверяется и при необходимости открывается заново.'
+            )
+        wrapper.close()
+
+    def test_03_connection_reused_without_checks(self, tmp_path):
+        wrapper = make_wrapper(
+            tmp_path / 'db.sqlite3', settings_dict={'CONN_MAX_AGE': 60}
+        )
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close_if_unusable_or_obsolete()
+        wrapper.ensure_connection()
+        assert wrapper.connection is raw, (
+            'Проверьте, что постоянное соединение не закрывается после '
+            'запроса.'
+        )
+        wrapper.close()
+
+    def test_04_pool_metrics(self, tmp_path, pool_alias, admin_client):
+        wrapper = make_wrapper(
+            tmp_path / 'db.sqlite3', alias=pool_alias,
+            pool={'max_size': 3, 'timeout': 1},
+        )
+        wrapper.ensure_connection()
+        content = admin_client.get('/api/v1/metrics/').content.decode()
+        wrapper.close()
+        for line in (
+            '# TYPE yamdb_db_pool_in_use gauge',
+            f'yamdb_db_pool_max_size{{alias="{pool_alias}"}} 3',
+            f'yamdb_db_pool_in_use{{alias="{pool_alias}"}} 1',
+            f'yamdb_db_pool_idle{{alias="{pool_alias}"}} 0',
+            f'yamdb_db_pool_wait_seconds_total{{alias="{pool_alias}"}} 0',
+        ):
+            assert line in content, (
+                'Проверьте, что состояние пула соединений отдаётся в '
+                'метриках.'
+            )
@@ -0,0 +1,143 @@
+from http import HTTPStatus
+from threading import current_thread
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import FileResponse
+from django.test import AsyncClient
+from django.urls import resolve
+
+from tests.utils import asgi_get, create_comments
+
+
+def async_request(method, url, *args, **kwargs):
+    async def request():
+        return await getattr(AsyncClient(), method)(url, *args, **kwargs)
+
+    return async_to_sync(request)()
+
+
+def async_get(url):
+    return async_request('get', url)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27AsyncViews:
+
+    def get_urls(self, admin_client, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        return (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            f'{comments[0]["id"]}/',
+        )
+
+    def test_01_async_matches_sync(self, admin_client, user_client, user,
+                                   client, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+        urls = self.get_urls(admin_client, user_client, user)
+        settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+        for url in urls:
+            assert iscoroutinefunction(resolve(url).func), (
+                f'Проверьте, что `{url}` в ASGI URLconf обслуживает '
+                'асинхронная вьюха.'
+            )
+            expected = client.get(url)
+            response = async_get(url)
+            assert response.status_code == expected.status_code
+            assert response.content == expected.content, (
+                f'Проверьте, что асинхронный ответ `{url}` совпадает с '
+                'синхронным.'
+            )
+        assert not iscoroutinefunction(resolve('/api/v1/users/me/').func)
+
+    def test_02_runs_in_worker_threads(self, admin_client, monkeypatch,
+                                       settings):
+        from api.views import CategoryViewSet
+
+        threads = []
+        original = CategoryViewSet.list
+
+        def list_view(self, request, *args, **kwargs):
+            threads.append(current_thread().name)
+            return original(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(CategoryViewSet, 'list', list_view)
+        settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+        assert async_get('/api/v1/categories/').status_code == HTTPStatus.OK
+        assert threads and threads[0].startswith('async-view'), (
+            'Проверьте, что чтение каталога выполняется в пуле рабочих '
+            'потоков.'
+        )
+
+    def test_03_writes_and_streaming(self, admin_client, user_client, user,
+                                     token_admin, client, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+        urls = self.get_urls(admin_client, user_client, user)
+        settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+        response = async_request(
+            'post',
+            '/api/v1/categories/',
+            {'name': 'Новая', 'slug': 'new'},
+            content_type='application/json',
+            authorization=f'Bearer {token_admin["access"]}',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запись через ASGI URLconf работает.'
+        )
+        settings.JSON_STREAM_MIN_ITEMS = 1
+        settings.JSON_STREAM_CHUNK_SIZE = 1
+        for url in (urls[0], urls[4]):
+            expected = b''.join(client.get(url).streaming_content)
+            response = async_get(url)
+            assert isinstance(response, FileResponse), (
+                'Проверьте, что потоковые ответы записываются во временный '
+                'файл в рабочем потоке.'
+            )
+            assert b''.join(response.streaming_content) == expected
+
+    def test_04_metrics_count_queries(self, admin_client, settings):
+        from api.metrics import registry
+
+        settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+        registry.clear()
+        async_get('/api/v1/categories/')
+        content = admin_client.get('/api/v1/metrics/').content.decode()
+        line = next(
+            line for line in content.splitlines()
+            if line.startswith(
+                'yamdb_request_queries_sum{route="category-list"}'
+            )
+        )
+        assert float(line.split()[-1]) > 0, (
+            'Проверьте, что SQL-запросы асинхронных вьюх попадают в '
+            'метрики.'
+        )
+
+    def test_05_export(self, admin_client, user_client, user, token_admin,
+                       settings):
+        create_comments(admin_client, {user: user_client})
+        for extension in ('csv', 'ndjson'):
+            url = f'/api/v1/export/reviews.{extension}'
+            expected = b''.join(admin_client.get(url).streaming_content)
+            settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+            assert iscoroutinefunction(resolve(url).func), (
+                'Проверьте, что выгрузка под ASGI выполняется в пуле '
+                'рабочих потоков.'
+            )
+            status, content = asgi_get(url, token_admin['access'])
+            settings.ROOT_URLCONF = 'api_yamdb.urls'
+            assert status == HTTPStatus.OK
+            assert content == expected, (
+                f'Проверьте, что `{url}` через ASGI URLconf отдаёт выгрузку '
+                'целиком.'
+            )
@@ -0,0 +1,68 @@
+import re
+
+import pytest
+
+from api.filters import TitleFilterSet
+from api.views import CommentsViewSet, ReviewViewSet, TitleViewSet
+from tests.utils import create_comments
+
+FULL_SCAN = re.compile(r'\bSCAN (reviews_\w+)(?! USING)')
+
+
+def check_plan(plan, index, sorted_by_index=True):
+    assert not FULL_SCAN.search(plan), (
+        f'Проверьте, что запрос не читает таблицу целиком:\n{plan}'
+    )
+    assert f'USING INDEX {index}' in plan or (
+        f'USING COVERING INDEX {index}' in plan
+    ), f'Проверьте, что запрос использует индекс `{index}`:\n{plan}'
+    if sorted_by_index:
+        assert 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что порядок строк берётся из индекса `{index}`:'
+            f'\n{plan}'
+        )
+
+
+def filter_titles(data):
+    return TitleFilterSet(data, queryset=TitleViewSet.queryset).qs
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28QueryPlans:
+
+    @pytest.fixture
+    def data(self, admin_client, user_client, user):
+        return create_comments(admin_client, {user: user_client})
+
+    def test_01_reviews_by_title(self, data):
+        _, _, titles = data
+        view = ReviewViewSet(kwargs={'title_id': titles[0]['id']})
+        check_plan(
+            view.get_queryset().explain(), 'review_title_pub_date_idx'
+        )
+
+    def test_02_comments_by_review(self, data):
+        _, reviews, titles = data
+        view = CommentsViewSet(kwargs={
+            'title_id': titles[0]['id'], 'review_id': reviews[0]['id'],
+        })
+        check_plan(
+            view.get_queryset().explain(), 'comment_review_pub_date_idx'
+        )
+
+    def test_03_titles_by_category_and_year(self, data):
+        _, _, titles = data
+        plan = filter_titles({
+            'category': titles[0]['category'], 'year': titles[0]['year'],
+        }).explain()
+        check_plan(plan, 'title_category_year_name_idx')
+
+    def test_04_titles_by_genre(self, data):
+        _, _, titles = data
+        genre, year = titles[0]['genre'][0], titles[0]['year']
+        for params in ({'genre': genre}, {'genre': genre, 'year': year}):
+            check_plan(
+                filter_titles(params).explain(),
+                'title_genre_genre_title_idx',
+                sorted_by_index=False,
+            )
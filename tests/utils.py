@@ -1,3 +1,4 @@
+import asyncio
 from http import HTTPStatus
 
 
@@ -305,3 +306,64 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def make_wrapper(name, alias='default', settings_dict=None, **options):
+    """Отдельное соединение с файлом ``name`` через бэкенд проекта."""
+    from api_yamdb.backends.sqlite.base import DatabaseWrapper
+
+    return DatabaseWrapper({
+        'ENGINE': 'api_yamdb.backends.sqlite',
+        'NAME': str(name),
+        'OPTIONS': options,
+        'ATOMIC_REQUESTS': False,
+        'AUTOCOMMIT': True,
+        'CONN_MAX_AGE': 0,
+        'TIME_ZONE': None,
+        'USER': '',
+        'PASSWORD': '',
+        'HOST': '',
+        'PORT': '',
+        'TEST': {},
+        **(settings_dict or {}),
+    }, alias)
+
+
+def asgi_get(path, token=None):
+    """GET-запрос через ``ASGIHandler``, как его выполняет ASGI-сервер.
+
+    Возвращает статус и тело ответа. В отличие от тестового клиента
+    потоковый ответ читается в цикле событий, где запросы к базе
+    запрещены.
+    """
+    from django.core.handlers.asgi import ASGIHandler
+
+    headers = [(b'host', b'testserver')]
+    if token is not None:
+        headers.append((b'authorization', f'Bearer {token}'.encode()))
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': headers,
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(ASGIHandler()(scope, receive, send))
+    return messages[0]['status'], b''.join(
+        message.get('body', b'') for message in messages[1:]
+    )